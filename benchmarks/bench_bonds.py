@@ -0,0 +1,54 @@
+"""Time the cell-list bond search for growing silicon supercells.
+
+Run from the repository root:
+
+    python benchmarks/bench_bonds.py
+
+The time per atom should stay roughly constant as the supercell grows.
+The silicon figure is then requested twice per size, as two reruns of the
+page would, and the figure cache's hit/miss counters are printed: every
+size should be one miss and one hit.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lattice import bond_segments, build_supercell
+from lattice_plot import figure_cache_stats, silicon_figure
+
+A = 5.43
+BOND_CUTOFF = 2.6
+
+
+def main(sizes=(2, 4, 6, 8, 10, 14, 20), repeats=3):
+    print(f"{'n':>4} {'atoms':>8} {'bonds':>8} {'time (ms)':>10} {'us/atom':>8}")
+    for n in sizes:
+        atoms = build_supercell(A, n)
+        best = np.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            x, _, _ = bond_segments(atoms, BOND_CUTOFF, box=n * A)
+            best = min(best, time.perf_counter() - start)
+        bonds = len(x) // 3
+        print(f"{n:>4} {len(atoms):>8} {bonds:>8} {best * 1e3:>10.2f} {best * 1e6 / len(atoms):>8.2f}")
+
+
+def figure_cache(sizes=(2, 4, 6)):
+    print(f"\n{'n':>4} {'first (ms)':>11} {'rerun (ms)':>11}")
+    for n in sizes:
+        times = []
+        for _ in range(2):
+            start = time.perf_counter()
+            silicon_figure(A, n, BOND_CUTOFF)
+            times.append(time.perf_counter() - start)
+        print(f"{n:>4} {times[0] * 1e3:>11.2f} {times[1] * 1e3:>11.2f}")
+    print("figure cache:", figure_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
+    figure_cache()
@@ -0,0 +1,72 @@
+"""Build time and JSON payload of the collaboration map as it grows.
+
+Run from the repository root:
+
+    python benchmarks/bench_collab_map.py --sites 10 100 1000
+
+Random sites, each linked to two others, are written to a temporary
+data directory in the data/collaborations layout. The script reports how
+long the first load (reading, layers and serialization) takes, the time
+per rerun once the deck is cached, and the size of the JSON sent to the
+browser.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def write_sites(directory, n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f"Institution {i}" for i in range(n)]
+    pd.DataFrame({
+        "name": names,
+        "place": [f"City {i}" for i in range(n)],
+        "lat": rng.uniform(-60, 70, n),
+        "lon": rng.uniform(-180, 180, n),
+        "color": [f"#{c:06x}c8" for c in rng.integers(0, 0xFFFFFF, n)],
+    }).to_csv(directory / "sites.csv", index=False)
+    source = np.repeat(np.arange(n), 2)
+    target = (source + rng.integers(1, n, len(source))) % n
+    pd.DataFrame({
+        "source": [names[i] for i in source],
+        "target": [names[i] for i in target],
+    }).to_csv(directory / "links.csv", index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--reruns", type=int, default=1000)
+    args = parser.parse_args()
+
+    from collab_map import load_deck
+
+    print(f"{'sites':>6} {'links':>6} {'first load (ms)':>16} {'rerun (us)':>11} {'JSON (kB)':>10}")
+    for n in args.sites:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            write_sites(directory, n)
+
+            start = time.perf_counter()
+            deck = load_deck(directory)
+            first = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(args.reruns):
+                load_deck(directory).to_json()
+            rerun = (time.perf_counter() - start) / args.reruns
+
+            print(f"{n:6d} {2 * n:6d} {first * 1e3:16.1f} {rerun * 1e6:11.1f} {len(deck.to_json()) / 1024:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Check that serving the DLTS figure does not grow memory across reruns.
+
+Run from the repository root:
+
+    python benchmarks/bench_figure_memory.py --reruns 10000 --renders 100
+
+`--reruns` requests the cached PNG the way every rerun of the Research
+Focus tab does, and `--renders` draws the figure uncached to check that no
+matplotlib figure outlives its render. Memory is traced with tracemalloc
+after a warm-up; the script exits with status 1 if it grew by more than
+--max-growth kB or if any figure is still alive.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def live_figures():
+    from matplotlib.figure import Figure
+
+    gc.collect()
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def traced_growth(fn, count, warmup=20):
+    """Traced memory growth (bytes) and time per call of `count` calls."""
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return growth, elapsed / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=10000)
+    parser.add_argument("--renders", type=int, default=100)
+    parser.add_argument("--max-growth", type=float, default=512, help="allowed growth in kB")
+    args = parser.parse_args()
+
+    from dlts_data import load_store
+    from dlts_plot import render_spectrum, spectrum_image
+
+    store = load_store()
+    sample = store.samples[0]
+    fluence = store.fluences(sample)[0]
+    windows = store.windows(sample, fluence)
+    T, signal = store.select(sample, fluence, windows)
+
+    failed = False
+    for name, fn, count in [
+        ("cached reruns", lambda: spectrum_image(store, sample, fluence, windows), args.reruns),
+        ("uncached renders", lambda: render_spectrum(T, signal, windows), args.renders),
+    ]:
+        growth, per_call = traced_growth(fn, count)
+        figures = live_figures()
+        ok = growth <= args.max_growth * 1024 and figures == 0
+        failed |= not ok
+        print(
+            f"{name}: {count} calls, {per_call * 1e3:.2f} ms/call, "
+            f"memory growth {growth / 1024:.1f} kB, live figures {figures} "
+            f"[{'ok' if ok else 'FAIL'}]"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
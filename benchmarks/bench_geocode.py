@@ -0,0 +1,56 @@
+"""Lookup time of the offline institution index.
+
+Run from the repository root:
+
+    python benchmarks/bench_geocode.py --repeat 20000
+
+Times building the index from data/institutions.csv and resolving names
+by exact match, alias and unique prefix, plus names that are not in the
+table (a misspelling, a similar but different institution and an unknown
+one), for which the trigram suggestions are timed as well.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+QUERIES = [
+    ("exact", "University of Pretoria"),
+    ("alias", "Wits"),
+    ("prefix", "Stellenbosch"),
+    ("misspelt", "Universty of Cape Twn"),
+    ("similar", "University of Cape Coast"),
+    ("unknown", "Nowhere College"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    from geocode import InstitutionIndex
+
+    start = time.perf_counter()
+    index = InstitutionIndex.from_csv()
+    print(f"build: {len(index)} institutions in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    for kind, name in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = index.resolve(name)
+        per_call = (time.perf_counter() - start) / args.repeat
+        print(f"{kind:>9}: {per_call * 1e6:6.1f} us  {name!r} -> {result.name if result else None}")
+        if result is None:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                hints = index.suggest(name)
+            per_call = (time.perf_counter() - start) / args.repeat
+            print(f"{'suggest':>9}: {per_call * 1e6:6.1f} us  {hints}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Rerun latency of the app with each tab open, rendered offline.
+
+Run from the repository root:
+
+    python benchmarks/bench_pages.py --reruns 10
+    python benchmarks/bench_pages.py --script /tmp/old/app-Copy5.py
+
+Each tab is opened in a fresh AppTest session (SCHOLAR_SOURCE=fixture) and
+the script is rerun `--reruns` times; the first run after opening is
+reported separately as it also fills the caches. --script measures another
+copy of the app, e.g. an older checkout, for before/after comparisons.
+
+AppTest always reruns the whole script, so these numbers include the
+header; a widget inside a fragment tab reruns only that tab in the browser.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+PAGES = [
+    "👤 About Me",
+    "🔬 Research Focus",
+    "📚 All Publications",
+    "✈️ Research Collaborations",
+    "🛠️ Skills",
+]
+
+
+def bench_page(script, page, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=300)
+    at.run()
+    at.session_state["tab"] = page
+
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return first, np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default=os.path.join(ROOT, "app-Copy5.py"))
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ["SCHOLAR_SOURCE"] = "fixture"
+
+    print(f"{'page':<28} {'first (ms)':>11} {'rerun median (ms)':>18} {'p95 (ms)':>9}")
+    for page in PAGES:
+        first, timings = bench_page(os.path.abspath(args.script), page, args.reruns)
+        print(
+            f"{page:<28} {first * 1e3:11.0f} {np.median(timings) * 1e3:18.1f} "
+            f"{np.percentile(timings, 95) * 1e3:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Load-test the Scholar caches offline against the recorded fixture.
+
+Run from the repository root:
+
+    python benchmarks/bench_scholar.py --latency 2 --failure-rate 0.3
+    python benchmarks/bench_scholar.py --app --reruns 20
+
+The first form hammers the shared profile cache from many threads while
+the fixture source is slow and fails at random, and reports how often the
+fallback profile was served. The second renders the whole app offline
+(SCHOLAR_SOURCE=fixture) and reports the time per rerun.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def bench_cache(threads, duration, latency, failure_rate, ttl):
+    from scholar import FALLBACK_PROFILE, FixtureScholarSource, ScholarProfileCache
+
+    source = FixtureScholarSource(latency=latency, jitter=latency / 2, failure_rate=failure_rate, seed=0)
+    cache = ScholarProfileCache("fixture", fetch=source.fetch_profile, ttl=ttl, retry_after=ttl)
+
+    timings, fallbacks = [], []
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def visitor():
+        local_t, local_f = [], 0
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            profile = cache.get()
+            local_t.append(time.perf_counter() - start)
+            local_f += profile is FALLBACK_PROFILE
+            time.sleep(0.001)
+        with lock:
+            timings.extend(local_t)
+            fallbacks.append(local_f)
+
+    workers = [threading.Thread(target=visitor) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    timings = np.array(timings) * 1e6
+    print(f"requests:        {len(timings)} from {threads} threads in {duration:.1f} s")
+    print(f"get() latency:   p50 {np.percentile(timings, 50):.1f} us, p99 {np.percentile(timings, 99):.1f} us")
+    print(f"fallback served: {sum(fallbacks) / len(timings):.1%}")
+    print(f"scrapes:         {source.calls} ({source.failures} injected failures)")
+    print(f"cache status:    {cache.status()}")
+
+
+def bench_app(reruns):
+    os.environ["SCHOLAR_SOURCE"] = "fixture"
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app-Copy5.py"), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    print(f"first run: {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    if at.exception:
+        print(at.exception)
+    times = np.array(times) * 1e3
+    print(f"reruns:    {reruns}, mean {times.mean():.0f} ms, p90 {np.percentile(times, 90):.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", action="store_true", help="benchmark full app reruns instead")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=1.0, help="simulated scrape time (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    parser.add_argument("--ttl", type=float, default=1.0, help="profile TTL for the test (s)")
+    args = parser.parse_args()
+
+    if args.app:
+        bench_app(args.reruns)
+    else:
+        bench_cache(args.threads, args.duration, args.latency, args.failure_rate, args.ttl)
+
+
+if __name__ == "__main__":
+    main()
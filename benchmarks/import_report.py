@@ -0,0 +1,95 @@
+"""Import-time report for the app's cold start and each lazily loaded tab.
+
+Run from the repository root:
+
+    python benchmarks/import_report.py
+    python benchmarks/import_report.py --top 5 --json import_times.json
+
+Every group of modules is imported in a fresh interpreter under
+`python -X importtime`. The startup group is what every script run of the
+app pays; each tab group is measured on top of it, so its time is only the
+extra cost of opening that tab for the first time. With --json the totals
+are written out so cold-start time can be tracked between commits.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Modules imported at the top of app-Copy5.py
+STARTUP = ["streamlit", "publications", "scholar"]
+
+# Modules imported inside each lazily rendered tab
+TABS = {
+    "Research Focus": [
+        "numpy", "dlts_analysis", "dlts_data", "dlts_plot", "laplace_dlts",
+        "lattice", "lattice_plot",
+    ],
+    # Only loaded when the live acquisition toggle is switched on
+    "Live DLTS": ["dlts_live"],
+    "Collaborations": ["collab_map"],
+    # Only loaded by the background profile refresh and abstract fetches
+    "Scholar refresh": ["scholarly"],
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(modules, preload=()):
+    """Top-level imports of `modules` as {name: cumulative microseconds}.
+
+    Modules in `preload` are imported first and left out of the result, as
+    are their dependencies.
+    """
+    code = "; ".join(f"import {m}" for m in [*preload, *modules])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    # Each import is listed once it finishes, nested ones first; a single
+    # space of indent marks a top-level import
+    times = {}
+    for line in result.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m or m[3] != " ":
+            continue
+        if m[4] in preload:
+            times.clear()   # everything so far is shared startup cost
+        else:
+            times[m[4]] = int(m[2])
+    return times
+
+
+def report(top):
+    groups = {"startup": import_times(STARTUP)}
+    for tab, modules in TABS.items():
+        groups[tab] = import_times(modules, preload=STARTUP)
+
+    summary = {}
+    for name, times in groups.items():
+        total = sum(times.values()) / 1e3
+        summary[name] = {"total_ms": round(total, 1), "modules": {k: round(v / 1e3, 1) for k, v in times.items()}}
+        print(f"{name}: {total:.0f} ms")
+        for module, us in sorted(times.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"    {us / 1e3:8.1f} ms  {module}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=8, help="modules listed per group")
+    parser.add_argument("--json", help="also write the totals to this file")
+    args = parser.parse_args()
+
+    summary = report(args.top)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+import streamlit as st
+
+from geocode import TABLE_PATH, get_index
+
+
+# -----------------------------
+# Collaboration files
+# -----------------------------
+# data/collaborations holds two CSV files:
+#   sites.csv - name, place, lat, lon and color ("#rrggbb" or "#rrggbbaa")
+#               of every institution; only the name is required, missing
+#               places and coordinates are looked up in the offline
+#               institution table (geocode.py)
+#   links.csv - source and target site names of every collaboration
+DATA_DIR = Path(__file__).parent / "data" / "collaborations"
+
+DEFAULT_COLOR = "#808080c8"
+SITE_RADIUS = 150000    # m
+ARC_WIDTH = 5
+COORD_DECIMALS = 4      # about 10 m, plenty for a world map
+
+
+def _parse_colors(hex_colors):
+    """RGBA uint8 array, one row per "#rrggbb[aa]" string."""
+    digits = [c.lstrip("#").ljust(8, "f")[:8] for c in hex_colors]
+    return np.frombuffer(bytes.fromhex("".join(digits)), dtype=np.uint8).reshape(-1, 4)
+
+
+def read_sites(path, index=None):
+    """Sites as columns: names, places, (N, 2) lon/lat array and RGBA colors.
+
+    Sites without coordinates are resolved by name with `index` (default:
+    the bundled institution table), by exact name, alias or unique prefix
+    only; any other name raises ValueError with the closest suggestions.
+    """
+    df = pd.read_csv(path, dtype={"name": str, "place": str})
+    for column in ("place", "lat", "lon"):
+        if column not in df:
+            df[column] = None
+    missing = df["lat"].isna() | df["lon"].isna()
+    if missing.any():
+        index = get_index() if index is None else index
+        found = {name: index.resolve(name) for name in df.loc[missing, "name"]}
+        unknown = [name for name, inst in found.items() if inst is None]
+        if unknown:
+            hints = []
+            for name in unknown:
+                close = index.suggest(name)
+                hints.append(f"{name} (did you mean {' or '.join(close)}?)" if close else name)
+            raise ValueError(
+                f"Unknown institutions (add them to {TABLE_PATH.name} or give their "
+                f"lat and lon in sites.csv): {'; '.join(hints)}"
+            )
+        df.loc[missing, "lat"] = [found[n].lat for n in df.loc[missing, "name"]]
+        df.loc[missing, "lon"] = [found[n].lon for n in df.loc[missing, "name"]]
+        no_place = missing & df["place"].isna()
+        df.loc[no_place, "place"] = [found[n].place for n in df.loc[no_place, "name"]]
+
+    colors = df["color"].fillna(DEFAULT_COLOR) if "color" in df else [DEFAULT_COLOR] * len(df)
+    return {
+        "name": df["name"].tolist(),
+        "place": df["place"].fillna("").tolist(),
+        "position": df[["lon", "lat"]].to_numpy(dtype=np.float64).round(COORD_DECIMALS),
+        "color": _parse_colors(colors),
+    }
+
+
+def read_links(path, names):
+    """(source, target) site indices of every link between known sites."""
+    df = pd.read_csv(path, dtype=str)
+    index = {name: i for i, name in enumerate(names)}
+    unknown = sorted(set(df["source"]).union(df["target"]) - index.keys())
+    if unknown:
+        raise ValueError(f"Links refer to unknown sites: {', '.join(unknown)}")
+    return df["source"].map(index).to_numpy(), df["target"].map(index).to_numpy()
+
+
+# -----------------------------
+# Deck
+# -----------------------------
+class PrecomputedDeck(pdk.Deck):
+    """A Deck serialized once, without indentation; to_json() returns it."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._json = json.dumps(json.loads(super().to_json()), separators=(",", ":"))
+
+    def to_json(self):
+        return self._json
+
+
+def _view_state(position):
+    """Centre the map on the sites and zoom to their extent."""
+    lo, hi = position.min(axis=0), position.max(axis=0)
+    span = max(float((hi - lo).max()), 1.0)
+    lon, lat = (lo + hi) / 2
+    return pdk.ViewState(
+        latitude=float(lat), longitude=float(lon),
+        zoom=float(np.clip(np.floor(np.log2(360 / span)), 1, 8)), pitch=40,
+    )
+
+
+def collaboration_deck(sites, links):
+    """Scatter of the sites plus one arc per link, serialized once.
+
+    The layers are built column-wise from the arrays: each site or arc is a
+    short record of number arrays, so the JSON grows by a few dozen bytes
+    per institution or link.
+    """
+    position, color = sites["position"], sites["color"]
+    source, target = links
+
+    site_data = [
+        {"name": n, "place": p, "position": xy, "color": c}
+        for n, p, xy, c in zip(sites["name"], sites["place"], position.tolist(), color.tolist())
+    ]
+    # Arcs take the colours of the sites they join, fading to 150 alpha
+    arc_color = color.copy()
+    arc_color[:, 3] = 150
+    arc_data = [
+        {"source": s, "target": t, "sourceColor": sc, "targetColor": tc}
+        for s, t, sc, tc in zip(
+            position[source].tolist(), position[target].tolist(),
+            arc_color[source].tolist(), arc_color[target].tolist(),
+        )
+    ]
+
+    layers = [
+        pdk.Layer(
+            "ScatterplotLayer",
+            site_data,
+            id="sites",
+            get_position="position",
+            get_color="color",
+            get_radius=SITE_RADIUS,
+            pickable=True,
+        ),
+        pdk.Layer(
+            "ArcLayer",
+            arc_data,
+            id="links",
+            get_source_position="source",
+            get_target_position="target",
+            get_source_color="sourceColor",
+            get_target_color="targetColor",
+            get_width=ARC_WIDTH,
+        ),
+    ]
+    return PrecomputedDeck(
+        layers=layers,
+        initial_view_state=_view_state(position),
+        tooltip={"text": "{name}\n{place}"},
+        map_style=None,  # no Mapbox token needed
+    )
+
+
+def _data_version(directory):
+    paths = [*sorted(Path(directory).glob("*.csv")), TABLE_PATH]
+    return tuple((p.name, p.stat().st_mtime_ns) for p in paths)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_deck(directory, version):
+    sites = read_sites(Path(directory) / "sites.csv")
+    links = read_links(Path(directory) / "links.csv", sites["name"])
+    return collaboration_deck(sites, links)
+
+
+def load_deck(directory=DATA_DIR):
+    """The collaboration map, built once per process and data version."""
+    return _load_deck(str(directory), _data_version(directory))
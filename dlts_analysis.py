@@ -0,0 +1,263 @@
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+
+
+# -----------------------------
+# Constants
+# -----------------------------
+K_B = 8.617333262e-5  # Boltzmann constant (eV/K)
+
+# gamma in e_n = gamma * sigma_n * T^2 * exp(-E_T / k_B T), for silicon
+# (cm^-2 s^-1 K^-2)
+GAMMA_SI = {"electron": 1.07e21, "hole": 1.78e21}
+
+# Emission rate (s^-1) of each rate window that dlts_pipeline and the live
+# simulator correlate transients with. Spectrum files record the rates they
+# were made with, and fits only ever use those (see dlts_data.py).
+RATE_WINDOWS = {
+    "RW1": 2.0,
+    "RW2": 5.0,
+    "RW3": 10.0,
+    "RW4": 20.0,
+    "RW5": 50.0,
+    "RW6": 100.0,
+    "RW7": 200.0,
+    "RW8": 500.0,
+}
+
+
+# -----------------------------
+# Smoothing, baseline and peak detection
+# -----------------------------
+def savgol_coefficients(window_length, order):
+    """Savitzky-Golay smoothing weights for an odd `window_length`."""
+    if window_length % 2 == 0 or window_length <= order:
+        raise ValueError("window_length must be odd and larger than order")
+    half = window_length // 2
+    x = np.arange(-half, half + 1, dtype=np.float64)
+    # Row 0 of the pseudo-inverse evaluates the local polynomial fit at x = 0
+    return np.linalg.pinv(np.vander(x, order + 1, increasing=True))[0]
+
+
+def savgol_smooth(signal, window_length=15, order=3):
+    """Savitzky-Golay filter along the last axis of every row at once.
+
+    Samples are treated as evenly spaced. The ends are padded by
+    reflection so the output has the same shape as `signal`.
+    """
+    signal = np.atleast_2d(np.asarray(signal, dtype=np.float64))
+    coeffs = savgol_coefficients(window_length, order)
+    half = window_length // 2
+    if signal.shape[1] <= half:
+        return signal.copy()
+    padded = np.pad(signal, ((0, 0), (half, half)), mode="reflect")
+    return np.lib.stride_tricks.sliding_window_view(padded, window_length, axis=1) @ coeffs
+
+
+def linear_baseline(T, signal, edge=0.05):
+    """Straight line per row through the median of each end of the scan.
+
+    `edge` is the fraction of points at either end taken as signal-free.
+    NaN points (outside a row's measured range) are skipped, so the ends
+    are those of the row's own data.
+    """
+    signal = np.atleast_2d(signal)
+    T = np.broadcast_to(np.asarray(T, dtype=np.float64), signal.shape)
+    valid = ~np.isnan(signal)
+    k = np.maximum(1, (edge * valid.sum(axis=1, keepdims=True)).astype(int))
+    head = valid & (np.cumsum(valid, axis=1) <= k)
+    tail = valid & (np.cumsum(valid[:, ::-1], axis=1)[:, ::-1] <= k)
+    t0, t1 = (np.nanmedian(np.where(m, T, np.nan), axis=1, keepdims=True) for m in (head, tail))
+    y0, y1 = (np.nanmedian(np.where(m, signal, np.nan), axis=1, keepdims=True) for m in (head, tail))
+    return y0 + (y1 - y0) * (T - t0) / (t1 - t0)
+
+
+def detect_peaks(T, signal, polarity=1, rel_height=0.3, distance=15):
+    """Temperatures of the peaks of every row.
+
+    A peak is the largest value of `polarity * signal` within `distance`
+    points on either side, so ripples on its flanks are not counted, and
+    at least `rel_height` times the row's largest value. Returns one array
+    of temperatures per row.
+    """
+    signal = polarity * np.atleast_2d(signal)
+    signal = np.where(np.isnan(signal), -np.inf, signal)
+    padded = np.pad(signal, ((0, 0), (distance, distance)), constant_values=-np.inf)
+    local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * distance + 1, axis=1).max(axis=2)
+    is_peak = (signal == local_max) & (signal > rel_height * signal.max(axis=1, keepdims=True))
+    rows, cols = np.nonzero(is_peak)
+    return np.split(np.asarray(T)[cols], np.searchsorted(rows, np.arange(1, len(signal))))
+
+
+@dataclass(frozen=True)
+class ProcessedSpectrum:
+    """Smoothed rate-window signals on a sorted temperature axis."""
+
+    T: np.ndarray
+    smoothed: np.ndarray    # one row per rate window
+    baseline: np.ndarray
+    peaks: list             # peak temperatures of each row
+
+    @property
+    def corrected(self):
+        return self.smoothed - self.baseline
+
+
+def preprocess(T, signal, window_length=15, order=3, polarity=1, rel_height=0.3):
+    """Smooth, baseline-correct and find the peaks of all rate windows."""
+    T = np.asarray(T, dtype=np.float64)
+    order_T = np.argsort(T, kind="stable")
+    T = T[order_T]
+    smoothed = savgol_smooth(np.atleast_2d(signal)[:, order_T], window_length, order)
+    baseline = linear_baseline(T, smoothed)
+    peaks = detect_peaks(T, smoothed - baseline, polarity, rel_height, distance=window_length)
+    return ProcessedSpectrum(T, smoothed, baseline, peaks)
+
+
+@st.cache_data(show_spinner=False)
+def _process_run(version, sample, fluence, windows, window_length, order, polarity, _store):
+    T, signal = _store.select(sample, fluence, list(windows))
+    return preprocess(T, signal, window_length, order, polarity)
+
+
+def process_run(store, sample, fluence=None, windows=None, window_length=15, order=3,
+                polarity=1):
+    """preprocess() on one run of a SpectrumStore, cached per data version."""
+    if windows is None:
+        windows = store.windows(sample, fluence)
+    return _process_run(store.version, sample, fluence, tuple(windows), window_length,
+                        order, polarity, store)
+
+
+# -----------------------------
+# Peak location
+# -----------------------------
+def peak_temperatures(T, signal, t_range=None, polarity=1):
+    """Locate the peak of every rate window in one vectorized pass.
+
+    `signal` has one row per rate window on the temperature axis `T`. The
+    peak is the extremum of `polarity * signal` inside `t_range`, refined
+    with a parabola through the three points around it. Returns one peak
+    temperature per row.
+    """
+    T = np.asarray(T, dtype=np.float64)
+    signal = np.atleast_2d(np.asarray(signal, dtype=np.float64))
+
+    order = np.argsort(T)
+    T = T[order]
+    signal = polarity * signal[:, order]
+    if t_range is not None:
+        inside = (T >= t_range[0]) & (T <= t_range[1])
+        T = T[inside]
+        signal = signal[:, inside]
+    if len(T) < 3:
+        raise ValueError("Need at least three temperature points in the peak range")
+    # Temperatures outside a row's measured range are NaN; never pick them
+    signal = np.where(np.isnan(signal), -np.inf, signal)
+
+    # Keep the three-point stencil inside the array
+    idx = np.clip(np.argmax(signal, axis=1), 1, len(T) - 2)
+    rows = np.arange(len(signal))
+    t0, t1, t2 = T[idx - 1], T[idx], T[idx + 1]
+    y0, y1, y2 = signal[rows, idx - 1], signal[rows, idx], signal[rows, idx + 1]
+
+    # Vertex of the parabola through the three points (unevenly spaced)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        num = (t1 - t0) ** 2 * (y1 - y2) - (t1 - t2) ** 2 * (y1 - y0)
+        den = (t1 - t0) * (y1 - y2) - (t1 - t2) * (y1 - y0)
+        vertex = t1 - 0.5 * num / den
+    ok = np.isfinite(vertex) & (vertex >= t0) & (vertex <= t2)
+    return np.where(ok, vertex, t1)
+
+
+# -----------------------------
+# Arrhenius fit
+# -----------------------------
+@dataclass(frozen=True)
+class TrapSignature:
+    """Activation energy and capture cross-section of one trap."""
+
+    energy: float           # E_T (eV)
+    energy_err: float
+    cross_section: float    # sigma_n (cm^2)
+    cross_section_err: float
+    inv_T: np.ndarray       # 1/T_peak (1/K), one per rate window
+    ln_rate: np.ndarray     # ln(e_n / T_peak^2)
+    gamma: float = GAMMA_SI["electron"]
+
+    def fit_line(self, inv_T=None):
+        """ln(e_n/T^2) predicted by the fit at `inv_T` (default: the peaks)."""
+        inv_T = self.inv_T if inv_T is None else np.asarray(inv_T)
+        return np.log(self.gamma * self.cross_section) - self.energy / K_B * inv_T
+
+
+def arrhenius_fit(peak_T, emission_rates, gamma=GAMMA_SI["electron"]):
+    """Fit ln(e_n/T^2) = ln(gamma sigma_n) - E_T/(k_B T) to the peaks.
+
+    Uncertainties are one standard error from the least-squares covariance;
+    they are NaN when there are only two rate windows.
+    """
+    peak_T = np.asarray(peak_T, dtype=np.float64)
+    emission_rates = np.asarray(emission_rates, dtype=np.float64)
+    if len(peak_T) < 2:
+        raise ValueError("Need peaks from at least two rate windows")
+
+    x = 1.0 / peak_T
+    y = np.log(emission_rates / peak_T ** 2)
+    A = np.column_stack([x, np.ones_like(x)])
+    (slope, intercept), *_ = np.linalg.lstsq(A, y, rcond=None)
+
+    dof = len(x) - 2
+    if dof > 0:
+        resid = y - A @ np.array([slope, intercept])
+        cov = np.linalg.inv(A.T @ A) * (resid @ resid) / dof
+        slope_err, intercept_err = np.sqrt(np.diag(cov))
+    else:
+        slope_err = intercept_err = np.nan
+
+    sigma = np.exp(intercept) / gamma
+    return TrapSignature(
+        energy=-slope * K_B,
+        energy_err=slope_err * K_B,
+        cross_section=sigma,
+        cross_section_err=sigma * intercept_err,
+        inv_T=x,
+        ln_rate=y,
+        gamma=gamma,
+    )
+
+
+def fit_trap(T, signal, windows, rates, t_range=None, polarity=1, carrier="electron"):
+    """Peak search plus Arrhenius fit for one trap across rate windows.
+
+    `rates` maps window names to their emission rates (s^-1); windows
+    without one are ignored.
+    """
+    known = [i for i, w in enumerate(windows) if w in rates]
+    if len(known) < 2:
+        raise ValueError("Need at least two rate windows with known emission rates")
+    emission_rates = np.array([rates[windows[i]] for i in known])
+    peaks = peak_temperatures(T, np.asarray(signal)[known], t_range, polarity)
+    return arrhenius_fit(peaks, emission_rates, GAMMA_SI[carrier])
+
+
+@st.cache_data(show_spinner=False)
+def _fit_run(version, sample, fluence, windows, t_range, polarity, carrier, _store):
+    T, signal = _store.select(sample, fluence, list(windows))
+    return fit_trap(T, signal, list(windows), _store.rates(sample, fluence), t_range,
+                    polarity, carrier)
+
+
+def fit_run(store, sample, fluence=None, windows=None, t_range=None, polarity=1,
+            carrier="electron"):
+    """fit_trap() on one run of a SpectrumStore, cached per data version.
+
+    Only the emission rates recorded in the run's spectrum files are used.
+    """
+    if windows is None:
+        windows = store.windows(sample, fluence)
+    t_range = None if t_range is None else tuple(float(t) for t in t_range)
+    return _fit_run(store.version, sample, fluence, tuple(windows), t_range,
+                    polarity, carrier, store)
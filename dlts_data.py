@@ -0,0 +1,374 @@
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# -----------------------------
+# DLTS spectrum files
+# -----------------------------
+# Spectra are stored column-wise in binary files instead of text:
+#   .npz     - "T" (temperature axis), "signal" (one float32 row per rate
+#              window), "windows" (the rate-window names) and optionally
+#              "sample", "fluence" and "rates" (the emission rate in s^-1
+#              of every window, NaN where it is not known)
+#   .parquet - a "T" column followed by one column per rate window, with
+#              "sample", "fluence" and "rates" ({window: emission rate})
+#              kept in the DataFrame attrs
+# Files without a sample name use the file name instead. Only windows
+# whose emission rate is recorded in the file can be used in an Arrhenius
+# fit.
+DATA_DIR = Path(__file__).parent / "data" / "dlts"
+
+
+def spectrum_path(name):
+    """Resolve a spectrum file name relative to DATA_DIR."""
+    path = Path(name)
+    if not path.is_absolute() and not path.exists():
+        path = DATA_DIR / path
+    return path
+
+
+def _npz_memmap(path, zf, name):
+    """Memory-map member `name` of an .npz file, or None if it is compressed.
+
+    np.savez stores its members uncompressed, each as a complete .npy file
+    inside the zip, so the array can be mapped at its offset in the file.
+    """
+    info = zf.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, "rb") as f:
+        # Skip the zip local file header (30 bytes, then name and extra field)
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = struct.unpack("<HH", f.read(4))
+        f.seek(name_len + extra_len, 1)
+        version = np.lib.format.read_magic(f)
+        if version not in ((1, 0), (2, 0)):
+            return None
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+    if dtype.hasobject or 0 in shape:
+        return None
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def _read_arrays(path):
+    """Read a spectrum file as (T, signal, windows, attrs).
+
+    The temperature axis and signal matrix of an uncompressed .npz file are
+    memory-mapped, so the data is only read from disk when it is used.
+    """
+    path = spectrum_path(path)
+    attrs = {}
+    if path.suffix == ".parquet":
+        # pyarrow memory-maps the file instead of reading it into a buffer
+        df = pd.read_parquet(path, memory_map=True)
+        windows = [c for c in df.columns if c != "T"]
+        T, signal = df["T"].to_numpy(), df[windows].to_numpy(dtype=np.float32).T
+        attrs.update(df.attrs)
+    elif path.suffix == ".npz":
+        with np.load(path) as data:
+            windows = data["windows"].tolist()
+            T, signal = (_npz_memmap(path, data.zip, key) for key in ("T", "signal"))
+            T = data["T"] if T is None else T
+            signal = data["signal"] if signal is None else signal
+            for key in ("sample", "fluence"):
+                if key in data:
+                    attrs[key] = data[key].item()
+            if "rates" in data:
+                attrs["rates"] = {
+                    w: float(rate) for w, rate in zip(windows, data["rates"])
+                    if np.isfinite(rate)
+                }
+    else:
+        raise ValueError(f"Unsupported spectrum file: {path}")
+
+    attrs.setdefault("sample", path.stem)
+    attrs.setdefault("fluence", None)
+    attrs.setdefault("rates", {})
+    return np.asarray(T), np.atleast_2d(np.asarray(signal)), windows, attrs
+
+
+def read_spectrum(path):
+    """Read a DLTS spectrum file into a DataFrame with a "T" column first.
+
+    The sample name, fluence and known emission rates ({window: rate}) are
+    returned in `df.attrs`.
+    """
+    T, signal, windows, attrs = _read_arrays(path)
+    df = pd.DataFrame({"T": T, **dict(zip(windows, signal))})
+    df.attrs.update(attrs)
+    return df
+
+
+def write_spectrum(path, df, sample=None, fluence=None, rates=None):
+    """Write a DataFrame with a "T" column and rate-window columns to disk.
+
+    `rates` maps window names to the emission rate (s^-1) each window was
+    recorded with; record them so the spectrum can be fitted.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    windows = [c for c in df.columns if c != "T"]
+    meta = {k: v for k, v in (("sample", sample), ("fluence", fluence)) if v is not None}
+    rates = {w: float(rates[w]) for w in windows if w in rates} if rates else {}
+    if path.suffix == ".parquet":
+        out = df[["T"] + windows].copy()
+        out.attrs = {**meta, "rates": rates} if rates else meta
+        out.to_parquet(path, index=False)
+    elif path.suffix == ".npz":
+        if rates:
+            meta["rates"] = np.array([rates.get(w, np.nan) for w in windows])
+        np.savez(
+            path,
+            T=df["T"].to_numpy(dtype=np.float64),
+            signal=df[windows].to_numpy(dtype=np.float32).T,
+            windows=np.array(windows),
+            **meta,
+        )
+    else:
+        raise ValueError(f"Unsupported spectrum file: {path}")
+
+
+# -----------------------------
+# Multi-rate-window store
+# -----------------------------
+class _Run:
+    """Temperature axis, signal matrix and row index of one run."""
+
+    __slots__ = ("T", "signal", "windows", "rates", "rows", "order")
+
+    def __init__(self, T, signal, windows, rates):
+        self.T = T
+        self.signal = signal
+        self.windows = windows
+        self.rates = rates
+        self.rows = {w: row for row, w in enumerate(windows)}
+        self.order = None   # argsort of T, built on first downsampled()
+
+
+class SpectrumStore:
+    """Every spectrum of a measurement campaign, grouped into runs.
+
+    A run is one (sample, fluence) measurement. Its rate windows share the
+    temperature axis they were recorded on and live in one read-only
+    float32 matrix with a row per window, so selecting a whole run is a
+    view and any other subset a dictionary lookup per row. Runs are never
+    resampled onto each other's axes; nothing is re-read or re-parsed.
+    `version` identifies the files the store was built from, for use in
+    cache keys.
+    """
+
+    def __init__(self, runs, version=None):
+        """`runs` maps (sample, fluence) to (T, signal, windows, rates), with
+        `rates` the known emission rates as {window: rate}."""
+        self.version = version
+        self._runs = {}
+        for run, (T, signal, windows, rates) in runs.items():
+            T = np.asarray(T, dtype=np.float64)
+            signal = np.atleast_2d(np.asarray(signal, dtype=np.float32))
+            windows = list(windows)
+            if signal.shape != (len(windows), len(T)):
+                raise ValueError(f"Run {run}: signal must have one row per window and one column per temperature")
+            duplicates = sorted({w for w in windows if windows.count(w) > 1})
+            if duplicates:
+                raise ValueError(f"Run {run} has more than one spectrum for {', '.join(duplicates)}")
+            T.flags.writeable = False
+            signal.flags.writeable = False
+            self._runs[run] = _Run(T, signal, windows, {w: rates[w] for w in windows if w in rates})
+        self.keys = [(s, f, w) for (s, f), run in self._runs.items() for w in run.windows]
+
+    @classmethod
+    def from_spectra(cls, spectra, version=None):
+        """Group spectra given as (T, signal, windows, attrs) into runs.
+
+        Every run keeps the temperature axis it was recorded on, and a run
+        from a single file keeps its arrays as they are (memory-mapped when
+        read from an .npz file). Files of one run recorded on different
+        axes are put on the union of their axes; temperatures outside a
+        file's own range are NaN rather than a copy of the end value.
+        """
+        grouped = {}
+        for spectrum in spectra:
+            attrs = spectrum[3]
+            grouped.setdefault((attrs.get("sample"), attrs.get("fluence")), []).append(spectrum)
+
+        runs = {}
+        for run, parts in grouped.items():
+            axes = [np.asarray(t, dtype=np.float64) for t, _, _, _ in parts]
+            T = axes[0]
+            if any(not np.array_equal(t, T) for t in axes[1:]):
+                T = np.unique(np.concatenate(axes))
+            rows, windows, rates = [], [], {}
+            for t, (_, signal, columns, attrs) in zip(axes, parts):
+                signal = np.asarray(signal, dtype=np.float32)
+                if t is not T:
+                    t_order = np.argsort(t)
+                    signal = np.stack([
+                        np.interp(T, t[t_order], row[t_order], left=np.nan, right=np.nan)
+                        for row in signal
+                    ]).astype(np.float32)
+                rows.append(signal)
+                windows += columns
+                rates.update(attrs.get("rates", {}))
+            runs[run] = (T, rows[0] if len(rows) == 1 else np.concatenate(rows), windows, rates)
+        return cls(runs, version)
+
+    @classmethod
+    def from_frames(cls, frames, version=None):
+        """Group spectra (as returned by read_spectrum) into runs."""
+        spectra = []
+        for df in frames:
+            windows = [c for c in df.columns if c != "T"]
+            spectra.append((df["T"].to_numpy(), df[windows].to_numpy().T, windows, df.attrs))
+        return cls.from_spectra(spectra, version)
+
+    @classmethod
+    def from_dir(cls, directory=DATA_DIR):
+        """Load every .npz and .parquet spectrum in `directory`.
+
+        Uncompressed .npz files are memory-mapped: building the store reads
+        their headers, and a run's data is read when it is first shown.
+        """
+        paths = _spectrum_files(directory)
+        return cls.from_spectra((_read_arrays(p) for p in paths), _data_version(paths))
+
+    @property
+    def samples(self):
+        return list(dict.fromkeys(s for s, _ in self._runs))
+
+    def fluences(self, sample):
+        return [f for s, f in self._runs if s == sample]
+
+    def windows(self, sample, fluence=None):
+        return list(self._runs[(sample, fluence)].windows)
+
+    def rates(self, sample, fluence=None):
+        """Emission rate (s^-1) of every window of a run that records one."""
+        return dict(self._runs[(sample, fluence)].rates)
+
+    def rows(self, sample, fluence=None, windows=None):
+        """Row selector within a run: a slice for the whole run, else indices."""
+        if windows is None:
+            return slice(None)
+        rows = self._runs[(sample, fluence)].rows
+        return [rows[w] for w in windows]
+
+    def select(self, sample, fluence=None, windows=None):
+        """Return (T, signal) for the chosen rate windows of one run."""
+        run = self._runs[(sample, fluence)]
+        return run.T, run.signal[self.rows(sample, fluence, windows)]
+
+    def frame(self, sample, fluence=None, windows=None):
+        """The selection as a DataFrame with a "T" column, for plotting."""
+        if windows is None:
+            windows = self.windows(sample, fluence)
+        T, signal = self.select(sample, fluence, windows)
+        df = pd.DataFrame(signal.T, columns=windows, copy=False)
+        df.insert(0, "T", T)
+        return df
+
+    def downsampled(self, sample, fluence=None, windows=None, t_range=None,
+                    max_points=None):
+        """Return (T, signal) sorted by T, inside `t_range`, at most
+        `max_points` temperatures long (see minmax_indices)."""
+        run = self._runs[(sample, fluence)]
+        if run.order is None:
+            run.order = np.argsort(run.T, kind="stable")
+        T = run.T[run.order]
+        lo, hi = 0, len(T)
+        if t_range is not None:
+            lo, hi = np.searchsorted(T, t_range[0]), np.searchsorted(T, t_range[1], side="right")
+        cols = run.order[lo:hi]
+        signal = run.signal[self.rows(sample, fluence, windows)]
+        if max_points is not None:
+            cols = cols[minmax_indices(signal[:, cols], max_points)]
+        return run.T[cols], signal[:, cols]
+
+
+# -----------------------------
+# Downsampling for charts
+# -----------------------------
+# Most temperatures the interactive chart draws per rate window; a browser
+# chart stays responsive well beyond this, and it is far more than a chart's
+# pixel width.
+MAX_CHART_POINTS = 2000
+
+
+def minmax_indices(signal, max_points):
+    """Columns of `signal` to keep so a line chart of it keeps its shape.
+
+    The columns are split into equal buckets and the minimum and maximum of
+    every row are kept in each bucket, plus the first and last column, so
+    peaks keep their height however far the data is reduced. The rows share
+    the result (they are drawn on one temperature axis), which has at most
+    `max_points` sorted columns.
+    """
+    signal = np.atleast_2d(signal)
+    rows, n = signal.shape
+    if n <= max_points:
+        return np.arange(n)
+
+    bins = max(1, (max_points - 2) // (2 * rows))
+    size = -(-n // bins)
+    # Pad the last bucket with its final column so every bucket is full
+    padded = np.pad(signal, ((0, 0), (0, bins * size - n)), mode="edge").reshape(rows, bins, size)
+    offsets = np.arange(bins) * size
+    # NaN (outside a spectrum's measured range) never wins a bucket
+    missing = np.isnan(padded)
+    keep = np.concatenate([
+        [0, n - 1],
+        (np.where(missing, np.inf, padded).argmin(axis=2) + offsets).ravel(),
+        (np.where(missing, -np.inf, padded).argmax(axis=2) + offsets).ravel(),
+    ])
+    return np.unique(np.minimum(keep, n - 1))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _chart_frame(version, sample, fluence, windows, t_range, max_points, _store):
+    T, signal = _store.downsampled(sample, fluence, list(windows), t_range, max_points)
+    return pd.DataFrame(signal.T, index=pd.Index(T, name="T"), columns=list(windows))
+
+
+def chart_frame(store, sample, fluence=None, windows=None, t_range=None,
+                max_points=MAX_CHART_POINTS):
+    """Downsampled selection indexed by T, for st.line_chart.
+
+    Computed once per data version, selection and zoom range (`t_range`)
+    and cached, so reruns send the same bounded number of points.
+    """
+    if windows is None:
+        windows = store.windows(sample, fluence)
+    t_range = None if t_range is None else tuple(float(t) for t in t_range)
+    return _chart_frame(store.version, sample, fluence, tuple(windows), t_range,
+                        max_points, store)
+
+
+def _spectrum_files(directory):
+    return sorted(p for p in Path(directory).iterdir() if p.suffix in (".npz", ".parquet"))
+
+
+def _data_version(paths):
+    return tuple((p.name, p.stat().st_mtime_ns) for p in paths)
+
+
+# One entry: a new data version drops the previous store and its file maps
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_store(directory, version):
+    return SpectrumStore.from_dir(directory)
+
+
+def load_store(directory=DATA_DIR):
+    """Load the spectrum store once per process and data version.
+
+    The store is shared between sessions, which is safe because its
+    arrays are read-only (memory-mapped .npz members are mapped read-only).
+    """
+    version = _data_version(_spectrum_files(directory))
+    return _load_store(str(directory), version)
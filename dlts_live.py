@@ -0,0 +1,398 @@
+"""Live DLTS acquisition: stream (T, RW*) samples into a chart as they arrive.
+
+Samples come from a local source, either a CSV file that the acquisition
+software appends to (set DLTS_LIVE_SOURCE to its path; the header line
+names the columns, "T" first) or, by default, a simulated temperature
+sweep. They are appended to a preallocated ring buffer shared by every
+session, and each session's chart is sent only the rows it has not seen.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from dlts_analysis import GAMMA_SI, K_B, RATE_WINDOWS
+from dlts_pipeline import boxcar_gates
+
+
+# -----------------------------
+# Settings
+# -----------------------------
+LIVE_SOURCE = os.environ.get("DLTS_LIVE_SOURCE", "simulator")
+BUFFER_SIZE = 20000      # samples kept, about a full high-resolution sweep
+REFRESH_INTERVAL = 1.0   # chart update period (s)
+
+
+# -----------------------------
+# Ring buffer
+# -----------------------------
+class RingBuffer:
+    """The latest `capacity` rows of a stream in one preallocated array.
+
+    Rows are numbered from 0 in arrival order; `total` is the number ever
+    appended, so a reader keeps the number it has seen and asks `since()`
+    for the rest. Appending never reallocates.
+    """
+
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self._data = np.empty((capacity, width), dtype=np.float64)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def first(self):
+        """Number of the oldest row still held."""
+        return max(0, self.total - self.capacity)
+
+    def append(self, rows):
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        with self._lock:
+            total = self.total + len(rows)
+            rows = rows[-self.capacity:]
+            pos = np.arange(total - len(rows), total) % self.capacity
+            self._data[pos] = rows
+            self.total = total
+
+    def since(self, start):
+        """Return (number of the first row, rows) from row `start` onwards.
+
+        Rows that have already been overwritten are skipped, so the first
+        number can be larger than `start`.
+        """
+        with self._lock:
+            start = min(max(start, self.first), self.total)
+            pos = np.arange(start, self.total) % self.capacity
+            return start, self._data[pos]
+
+    def clear(self):
+        with self._lock:
+            self.total = 0
+
+
+# -----------------------------
+# Sample sources
+# -----------------------------
+class SimulatedSweep:
+    """Boxcar DLTS signal of one trap during a linear temperature ramp.
+
+    Samples become available in real time at `sample_rate` per second, so
+    the spectrum grows at the pace of a measurement. The sweep stops at
+    `t_stop`.
+    """
+
+    def __init__(self, windows=tuple(RATE_WINDOWS), t_start=80.0, t_stop=320.0, ramp=4.0,
+                 sample_rate=20.0, energy=0.42, cross_section=1e-15, noise=0.005, seed=0):
+        self.columns = ["T", *windows]
+        self._rates = np.array([RATE_WINDOWS[w] for w in windows])
+        self._t_start, self._t_stop = t_start, t_stop
+        self._step = ramp / sample_rate
+        self._sample_rate = sample_rate
+        self._trap = (energy, cross_section)
+        self._noise = noise
+        self._rng = np.random.default_rng(seed)
+        self.restart()
+
+    def restart(self):
+        self._started = time.monotonic()
+        self._sent = 0
+
+    def _signal(self, T):
+        energy, sigma = self._trap
+        e = GAMMA_SI["electron"] * sigma * T[:, None] ** 2 * np.exp(-energy / (K_B * T[:, None]))
+        t1, t2 = boxcar_gates(self._rates)
+        signal = np.exp(-e * t1) - np.exp(-e * t2)
+        return signal + self._noise * self._rng.standard_normal(signal.shape)
+
+    def read(self):
+        """Samples that became available since the previous call."""
+        n_total = int((self._t_stop - self._t_start) / self._step) + 1
+        due = min(int((time.monotonic() - self._started) * self._sample_rate), n_total)
+        T = self._t_start + self._step * np.arange(self._sent, due)
+        self._sent = due
+        return np.column_stack([T, self._signal(T)])
+
+
+class FileTailSource:
+    """Rows appended to a CSV file since the previous read.
+
+    The file need not exist yet: until it does and its header line is
+    complete, read() returns no rows and `columns` is None. Rows that are
+    not one number per column are skipped and counted in `bad_rows`.
+    restart() reads the file again from the first row after the header.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.columns = None
+        self.bad_rows = 0
+        self._data_start = None
+        self.restart()
+
+    def restart(self):
+        self._offset = self._data_start
+        self.bad_rows = 0
+
+    def _rows(self, lines):
+        rows = []
+        for line in lines:
+            fields = line.split(",")
+            if not line.strip():
+                continue
+            try:
+                if len(fields) != len(self.columns):
+                    raise ValueError(line)
+                rows.append([float(x) for x in fields])
+            except ValueError:
+                self.bad_rows += 1
+        return np.array(rows, dtype=np.float64).reshape(-1, len(self.columns))
+
+    def read(self):
+        try:
+            with open(self.path, "rb") as f:
+                if self._data_start is None:
+                    header = f.readline()
+                    if not header.endswith(b"\n"):
+                        return np.empty((0, 0))
+                    self.columns = [c.strip() for c in header.decode().split(",")]
+                    self._data_start = self._offset = f.tell()
+                f.seek(self._offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return np.empty((0, len(self.columns or ())))
+        # Leave a partly written last line for the next read
+        end = chunk.rfind(b"\n") + 1
+        rows = self._rows(chunk[:end].decode(errors="replace").splitlines())
+        self._offset += end
+        return rows
+
+
+# -----------------------------
+# Shared acquisition
+# -----------------------------
+class LiveAcquisition:
+    """A sample source feeding a RingBuffer, polled by every session.
+
+    The buffer is created once the source knows its columns; for a file
+    that is when its header line has been written. Until then `buffer` is
+    None.
+    """
+
+    def __init__(self, source, capacity=BUFFER_SIZE):
+        self.source = source
+        self.capacity = capacity
+        self.buffer = None
+        self._lock = threading.Lock()
+        self._open_buffer()
+
+    @property
+    def columns(self):
+        return self.source.columns
+
+    def _open_buffer(self):
+        if self.buffer is None and self.source.columns:
+            self.buffer = RingBuffer(self.capacity, len(self.source.columns))
+
+    def poll(self):
+        """Move new samples from the source into the buffer."""
+        with self._lock:
+            rows = self.source.read()
+            self._open_buffer()
+            if len(rows):
+                self.buffer.append(rows)
+
+    def restart(self):
+        with self._lock:
+            self.source.restart()
+            if self.buffer is not None:
+                self.buffer.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_acquisition(source):
+    if source == "simulator":
+        return LiveAcquisition(SimulatedSweep())
+    return LiveAcquisition(FileTailSource(source))
+
+
+def get_acquisition(source=None):
+    """The process-wide acquisition for `source` ("simulator" or a CSV path).
+
+    The cache is keyed on the resolved source, so every caller of the
+    default (LIVE_SOURCE) shares one acquisition.
+    """
+    return _get_acquisition(LIVE_SOURCE if source is None else str(source))
+
+
+# -----------------------------
+# Incremental chart
+# -----------------------------
+# The browser keeps the plotted history; every update carries only new rows
+# numbered from `start`, and only their line segments are drawn. The canvas
+# is redrawn in full only when the axis range (kept with some headroom) or
+# the width changes. A `reset` update replaces the history, and a chart
+# that finds a gap (e.g. after it was remounted) asks for one via "resync".
+_CHART_JS = """
+export default function(component) {
+    const { data, parentElement, setTriggerValue } = component;
+    const canvas = parentElement.querySelector("canvas");
+    const s = parentElement.__dlts || (parentElement.__dlts = { total: 0, T: [], Y: [], drawn: 0, box: null });
+    if (!data) return;
+
+    if (data.reset) {
+        Object.assign(s, { total: data.start, T: [], Y: data.columns.slice(1).map(() => []), drawn: 0 });
+    } else if (data.start > s.total) {
+        setTriggerValue("resync", true);
+        return;
+    }
+    const skip = s.total - data.start;
+    for (let i = Math.max(skip, 0); i < data.T.length; i++) {
+        s.T.push(data.T[i]);
+        data.Y.forEach((col, j) => s.Y[j].push(col[i]));
+    }
+    s.total = Math.max(s.total, data.start + data.T.length);
+    // Rows dropped from the history stay drawn until the next full redraw
+    const extra = s.T.length - data.capacity;
+    if (extra > 0) {
+        s.T.splice(0, extra);
+        s.Y.forEach((col) => col.splice(0, extra));
+        s.drawn = Math.max(s.drawn - extra, 0);
+    }
+
+    const bounds = (from) => {
+        const b = { x0: Infinity, x1: -Infinity, y0: Infinity, y1: -Infinity };
+        for (let i = from; i < s.T.length; i++) {
+            b.x0 = Math.min(b.x0, s.T[i]);
+            b.x1 = Math.max(b.x1, s.T[i]);
+            s.Y.forEach((col) => { b.y0 = Math.min(b.y0, col[i]); b.y1 = Math.max(b.y1, col[i]); });
+        }
+        return b;
+    };
+    // Only the new rows are scanned; the axes (and so every drawn point)
+    // change only when one of them falls outside the current range
+    const fresh = bounds(s.drawn), box = s.box;
+    const full = data.reset || !box || canvas.clientWidth !== s.width
+        || fresh.x0 < box.x0 || fresh.x1 > box.x1 || fresh.y0 < box.y0 || fresh.y1 > box.y1;
+    const ctx = canvas.getContext("2d");
+    if (full) {
+        s.width = canvas.width = canvas.clientWidth;   // also clears the canvas
+        s.drawn = 0;
+        s.box = null;
+        if (!s.T.length) return;
+        // Headroom in the direction the sweep runs, so it rescales only
+        // every so often
+        const all = bounds(0);
+        const dx = all.x1 - all.x0 || 1, dy = all.y1 - all.y0 || 1;
+        const up = s.T[s.T.length - 1] >= s.T[0];
+        s.box = {
+            x0: all.x0 - (up ? 0 : 0.5 * dx), x1: all.x1 + (up ? 0.5 * dx : 0),
+            y0: all.y0 - 0.1 * dy, y1: all.y1 + 0.1 * dy,
+        };
+    }
+    if (!s.T.length) return;
+
+    const w = canvas.width, h = canvas.height;
+    const { x0, x1, y0, y1 } = s.box;
+    const px = (x) => 50 + (w - 60) * (x - x0) / (x1 - x0);
+    const py = (y) => h - 30 - (h - 40) * (y - y0) / (y1 - y0);
+    ctx.font = "11px sans-serif";
+    if (full) {
+        ctx.strokeStyle = "#888";
+        ctx.strokeRect(50, 10, w - 60, h - 40);
+        ctx.fillStyle = "#888";
+        ctx.fillText(`${x0.toFixed(0)} K`, 50, h - 12);
+        ctx.fillText(`${x1.toFixed(0)} K`, w - 60, h - 12);
+    }
+    // Continue every line from the last point already drawn
+    const from = Math.max(s.drawn - 1, 0);
+    s.Y.forEach((col, j) => {
+        ctx.strokeStyle = `hsl(${(360 * j) / s.Y.length}, 70%, 45%)`;
+        ctx.beginPath();
+        ctx.moveTo(px(s.T[from]), py(col[from]));
+        for (let i = from + 1; i < col.length; i++) ctx.lineTo(px(s.T[i]), py(col[i]));
+        ctx.stroke();
+        if (full) {
+            ctx.fillStyle = ctx.strokeStyle;
+            ctx.fillText(data.columns[j + 1], 60 + 45 * j, 24);
+        }
+    });
+    s.drawn = s.T.length;
+}
+"""
+
+_live_chart = st.components.v2.component(
+    "dlts_live_chart",
+    html='<canvas style="width: 100%; height: 360px" height="360"></canvas>',
+    js=_CHART_JS,
+)
+
+
+def reset_live_chart():
+    """Make the next live_chart() update resend the whole buffer."""
+    st.session_state["dlts_live_reset"] = True
+
+
+def live_chart(acquisition):
+    """Send the rows this session's chart has not seen yet; return their count.
+
+    Call reset_live_chart() whenever the chart may have been re-created,
+    i.e. on every run of the page around the refreshing fragment.
+    """
+    cursor = st.session_state.get("dlts_live_cursor")
+    # A restarted acquisition numbers its rows from 0 again
+    reset = (st.session_state.get("dlts_live_reset", True) or cursor is None
+             or cursor > acquisition.buffer.total)
+    start, rows = acquisition.buffer.since(acquisition.buffer.first if reset else cursor)
+    st.session_state["dlts_live_cursor"] = start + len(rows)
+    st.session_state["dlts_live_reset"] = False
+
+    _live_chart(
+        key="dlts_live",
+        data={
+            "reset": reset,
+            "start": start,
+            "capacity": acquisition.buffer.capacity,
+            "columns": acquisition.columns,
+            "T": rows[:, 0].tolist(),
+            "Y": rows[:, 1:].T.tolist(),
+        },
+        on_resync_change=reset_live_chart,
+    )
+    return len(rows)
+
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def live_panel(source=None):
+    """Poll the acquisition and update the chart every REFRESH_INTERVAL.
+
+    A source that cannot be read only replaces the chart with a warning,
+    so the rest of the page still renders; the next refresh tries again.
+    """
+    try:
+        acquisition = get_acquisition(source)
+        if st.button("Restart sweep"):
+            acquisition.restart()
+        acquisition.poll()
+    except (OSError, ValueError) as e:
+        st.warning(f"Could not read the live samples: {e}")
+        return
+
+    buffer = acquisition.buffer
+    simulated = "Simulated sweep: " if isinstance(acquisition.source, SimulatedSweep) else ""
+    if buffer is None:
+        st.caption(f"Waiting for {acquisition.source.path.name}...")
+        return
+    live_chart(acquisition)
+
+    if buffer.total:
+        _, last = buffer.since(buffer.total - 1)
+        status = f"{simulated}{buffer.total} samples, now at {last[0, 0]:.1f} K"
+    else:
+        status = f"{simulated}waiting for samples..."
+    bad_rows = getattr(acquisition.source, "bad_rows", 0)
+    if bad_rows:
+        status += f" ({bad_rows} malformed rows skipped)"
+    st.caption(status)
@@ -0,0 +1,70 @@
+import io
+
+import streamlit as st
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+# -----------------------------
+# Figure styles
+# -----------------------------
+# Matplotlib settings per style name; "publication" matches the figure that
+# used to be drawn with pyplot on every rerun.
+STYLES = {
+    "publication": {
+        "figsize": (10, 5),
+        "dpi": 150,
+        "grid": {"which": "both", "linestyle": "--", "alpha": 0.5},
+        "single_color": "red",
+    },
+}
+
+FORMATS = ("png", "svg")
+
+
+def render_spectrum(T, signal, windows, fmt="png", style="publication"):
+    """Draw a DLTS spectrum and return it as PNG or SVG bytes.
+
+    `signal` has one row per rate window in `windows`. The figure is built
+    on a standalone Figure rather than through pyplot, so it is never
+    registered with pyplot's global figure list; it is cleared before
+    returning, leaving nothing behind in the server process.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    opts = STYLES[style]
+
+    fig = Figure(figsize=opts["figsize"], dpi=opts["dpi"])
+    try:
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        color = opts["single_color"] if len(windows) == 1 else None
+        for w, row in zip(windows, signal):
+            ax.plot(T, row, color=color, label=f'{w} Signal')
+        ax.set_xlabel("Temperature (K)")
+        ax.set_ylabel(f"Capacitance ({windows[0]})" if len(windows) == 1 else "Capacitance")
+        ax.grid(True, **opts["grid"])
+        ax.legend()
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _spectrum_image(version, sample, fluence, windows, fmt, style, _store):
+    T, signal = _store.select(sample, fluence, list(windows))
+    return render_spectrum(T, signal, list(windows), fmt, style)
+
+
+def spectrum_image(store, sample, fluence=None, windows=None, fmt="png", style="publication"):
+    """render_spectrum() for one run of a SpectrumStore, cached per data version.
+
+    The image is drawn once per run, window selection, format and style;
+    every other rerun is served the cached bytes.
+    """
+    if windows is None:
+        windows = store.windows(sample, fluence)
+    return _spectrum_image(store.version, sample, fluence, tuple(windows), fmt, style, store)
@@ -0,0 +1,145 @@
+"""Offline institution-to-coordinate lookup for the collaboration map.
+
+Institutions are resolved from the bundled table data/institutions.csv
+(name, aliases separated by ";", place, lat, lon), so collaborator lists
+can give names only and the page never calls a geocoding service. Add a
+row there for any institution that is not found.
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+TABLE_PATH = Path(__file__).parent / "data" / "institutions.csv"
+
+# Smallest trigram similarity (Dice coefficient) of a name suggested for
+# one that is not in the table
+MIN_SIMILARITY = 0.6
+
+_PARENS = re.compile(r"\([^)]*\)")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(name):
+    """Lower-case ASCII words of `name`, without parentheses or a leading "the"."""
+    text = unicodedata.normalize("NFKD", _PARENS.sub(" ", name))
+    text = text.encode("ascii", "ignore").decode().lower()
+    text = _NON_WORD.sub(" ", text).strip()
+    return text[4:] if text.startswith("the ") else text
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True, slots=True)
+class Institution:
+    name: str
+    place: str
+    lat: float
+    lon: float
+
+
+class InstitutionIndex:
+    """Name lookup by exact match (name or alias) or unique prefix.
+
+    Every name and alias is normalized once. An exact match is a dict
+    lookup and prefixes are found by bisection in the sorted keys. Trigram
+    similarity, which scores every key at once from a key-by-trigram
+    matrix, only suggests names for one that is not found: similar names
+    are often different institutions (University of Cape Coast and
+    University of Cape Town), so it never resolves one.
+    """
+
+    def __init__(self, institutions, aliases=()):
+        self.institutions = list(institutions)
+        keys = {}
+        for i, inst in enumerate(self.institutions):
+            keys[normalize(inst.name)] = i
+        for alias, i in aliases:
+            keys.setdefault(normalize(alias), i)
+        self._keys = keys
+        self._sorted = sorted(keys)
+
+        key_grams = [trigrams(k) for k in self._sorted]
+        self._gram_ids = {g: j for j, g in enumerate(sorted(set().union(*key_grams)))}
+        self._grams = np.zeros((len(self._sorted), len(self._gram_ids)), dtype=np.uint8)
+        for row, grams in enumerate(key_grams):
+            self._grams[row, [self._gram_ids[g] for g in grams]] = 1
+        self._gram_counts = self._grams.sum(axis=1)
+        self._owner = np.array([keys[k] for k in self._sorted])
+
+    @classmethod
+    def from_csv(cls, path=TABLE_PATH):
+        df = pd.read_csv(path, dtype={"name": str, "aliases": str, "place": str})
+        institutions = [
+            Institution(row.name, row.place, float(row.lat), float(row.lon))
+            for row in df.itertuples(index=False)
+        ]
+        aliases = [
+            (alias, i)
+            for i, names in enumerate(df["aliases"].fillna(""))
+            for alias in names.split(";") if alias.strip()
+        ]
+        return cls(institutions, aliases)
+
+    def __len__(self):
+        return len(self.institutions)
+
+    def _prefix(self, key):
+        start = bisect_left(self._sorted, key)
+        hits = set()
+        for candidate in self._sorted[start:]:
+            if not candidate.startswith(key):
+                break
+            hits.add(self._keys[candidate])
+        return hits
+
+    def similar(self, name, limit=3):
+        """Up to `limit` (similarity, Institution) pairs, best first."""
+        grams = trigrams(normalize(name))
+        cols = [self._gram_ids[g] for g in grams if g in self._gram_ids]
+        shared = self._grams[:, cols].sum(axis=1)
+        dice = 2 * shared / (len(grams) + self._gram_counts)
+        # Best score of each institution over its name and aliases
+        scores = np.zeros(len(self.institutions))
+        np.maximum.at(scores, self._owner, dice)
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return [(float(scores[i]), self.institutions[i]) for i in best if scores[i] > 0]
+
+    def suggest(self, name, limit=3):
+        """Names of up to `limit` institutions that `name` may have meant."""
+        return [inst.name for score, inst in self.similar(name, limit) if score >= MIN_SIMILARITY]
+
+    def resolve(self, name):
+        """The Institution called `name`, or None if it is not in the table."""
+        key = normalize(name)
+        if not key:
+            return None
+        if key in self._keys:
+            return self.institutions[self._keys[key]]
+        hits = self._prefix(key)
+        if len(hits) == 1:
+            return self.institutions[hits.pop()]
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def _get_index(path, mtime):
+    return InstitutionIndex.from_csv(path)
+
+
+def get_index(path=TABLE_PATH):
+    """The institution index, built once per process and table version.
+
+    Editing the table (a new modification time) builds a fresh index.
+    """
+    path = Path(path)
+    return _get_index(str(path), path.stat().st_mtime_ns)
@@ -0,0 +1,176 @@
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+
+# -----------------------------
+# Laplace DLTS transient files
+# -----------------------------
+# Each .npz file in data/ldlts holds one isothermal scan:
+#   "t" - sampling times of the transients (s)
+#   "C" - capacitance transients, one row per temperature
+#   "T" - temperature of each transient (K)
+DATA_DIR = Path(__file__).parent / "data" / "ldlts"
+
+
+def read_transients(path):
+    """Return (t, C, T) from a transient file."""
+    with np.load(path) as data:
+        return data["t"], data["C"], data["T"]
+
+
+def simulate_transients(T, energies, cross_sections, amplitudes, t, noise=1e-3, seed=0,
+                        gamma=1.07e21):
+    """Capacitance transients of several traps at each temperature in `T`.
+
+    Used to demonstrate the inversion when no measured transients are
+    available; `noise` is relative to the total amplitude.
+    """
+    k_b = 8.617333262e-5
+    T = np.asarray(T, dtype=np.float64)[:, None, None]
+    energies = np.asarray(energies)[None, :, None]
+    sigma = np.asarray(cross_sections)[None, :, None]
+    amps = np.asarray(amplitudes)[None, :, None]
+
+    rates = gamma * sigma * T ** 2 * np.exp(-energies / (k_b * T))
+    C = (amps * np.exp(-rates * np.asarray(t)[None, None, :])).sum(axis=1)
+    rng = np.random.default_rng(seed)
+    return C + noise * amps.sum() * rng.standard_normal(C.shape)
+
+
+def demo_transients():
+    """Simulated scan of two traps only 20 meV apart (0.42 and 0.44 eV).
+
+    Their conventional DLTS peaks overlap; Laplace DLTS separates them.
+    """
+    t = np.arange(1, 2001) * 1e-4
+    T = np.linspace(200, 260, 61)
+    C = simulate_transients(T, [0.42, 0.44], [1e-15, 1e-15], [1.0, 0.6], t)
+    return t, C, T
+
+
+# -----------------------------
+# Regularized inversion
+# -----------------------------
+class LaplaceInverter:
+    """Inverse Laplace transform of transients sampled on a fixed time grid.
+
+    The transient is modelled as C(t) = sum_k f_k exp(-e_k t) over a
+    log-spaced grid of emission rates e_k, and f is found by Tikhonov
+    regularization with a second-derivative smoothness penalty (as in
+    CONTIN). The kernel and the regularized solution operator are computed
+    once per time grid and `alpha`; inverting a batch of transients is then
+    a single matrix product, optionally followed by a batched projected
+    gradient solve that enforces f >= 0.
+    """
+
+    def __init__(self, t, rate_min=None, rate_max=None, n_rates=100, alpha=1e-4):
+        self.t = np.asarray(t, dtype=np.float64)
+        if rate_min is None:
+            rate_min = 0.1 / self.t[-1]
+        if rate_max is None:
+            rate_max = 1.0 / (self.t[0] if self.t[0] > 0 else self.t[1])
+        self.rates = np.logspace(np.log10(rate_min), np.log10(rate_max), n_rates)
+        self.alpha = alpha
+
+        self.kernel = np.exp(-np.outer(self.t, self.rates))
+        # Scale alpha with the kernel so it does not depend on the sample count
+        scale = np.linalg.norm(self.kernel, 2)
+        diff2 = np.diff(np.eye(n_rates), 2, axis=0)
+        self._penalty = alpha * scale * diff2
+
+        # Solution operator of the stacked least-squares problem
+        #   min |K f - C|^2 + |alpha L f|^2
+        stacked = np.vstack([self.kernel, self._penalty])
+        self._solve = np.linalg.pinv(stacked, rcond=1e-12)[:, :len(self.t)]
+
+        # Normal matrix and step size for the non-negative solve
+        self._gram = self.kernel.T @ self.kernel + self._penalty.T @ self._penalty
+        self._step = 1.0 / np.linalg.eigvalsh(self._gram)[-1]
+
+    def invert(self, C, nonneg=True, iterations=1000):
+        """Return the Laplace spectra of a batch of transients (one per row)."""
+        C = np.atleast_2d(np.asarray(C, dtype=np.float64))
+        F = C @ self._solve.T
+        if not nonneg:
+            return F
+
+        # Accelerated projected gradient (FISTA) on the whole batch at once
+        rhs = C @ self.kernel
+        F = np.maximum(F, 0.0)
+        Y, t_k = F, 1.0
+        for _ in range(iterations):
+            F_next = np.maximum(Y - self._step * (Y @ self._gram - rhs), 0.0)
+            t_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t_k ** 2))
+            Y = F_next + ((t_k - 1.0) / t_next) * (F_next - F)
+            F, t_k = F_next, t_next
+        return F
+
+    def stream(self, C, batch_size=32, **kwargs):
+        """Invert `C` in batches, yielding (rows done, spectra of the batch)."""
+        C = np.atleast_2d(C)
+        for start in range(0, len(C), batch_size):
+            stop = min(start + batch_size, len(C))
+            yield stop, self.invert(C[start:stop], **kwargs)
+
+
+def peak_rates(spectra, rates, rel_height=0.1):
+    """Emission rates of the local maxima of each Laplace spectrum.
+
+    Maxima below `rel_height` times the spectrum's largest value are
+    dropped. Returns one array of rates per spectrum.
+    """
+    spectra = np.atleast_2d(spectra)
+    inner = spectra[:, 1:-1]
+    is_peak = (
+        (inner > spectra[:, :-2])
+        & (inner >= spectra[:, 2:])
+        & (inner > rel_height * spectra.max(axis=1, keepdims=True))
+    )
+    rows, cols = np.nonzero(is_peak)
+    return np.split(np.asarray(rates)[cols + 1], np.searchsorted(rows, np.arange(1, len(spectra))))
+
+
+@st.cache_resource(show_spinner=False)
+def get_inverter(t, rate_min=None, rate_max=None, n_rates=100, alpha=1e-4):
+    """Shared LaplaceInverter per time grid and regularization settings."""
+    return LaplaceInverter(t, rate_min, rate_max, n_rates, alpha)
+
+
+@st.cache_resource(show_spinner=False)
+def result_cache():
+    """Process-wide dict of finished inversions, keyed by the caller."""
+    return {}
+
+
+def laplace_figure(T, rates, spectra):
+    """Heatmap of Laplace spectra against temperature and emission rate.
+
+    The resolved peaks of every spectrum (see peak_rates) are marked on top.
+    """
+    T = np.asarray(T)[:len(spectra)]
+    fig = go.Figure(go.Heatmap(
+        x=T,
+        y=rates,
+        z=np.asarray(spectra).T,
+        colorscale="Viridis",
+        colorbar=dict(title="Amplitude")
+    ))
+    peaks = peak_rates(spectra, rates)
+    fig.add_trace(go.Scatter(
+        x=np.repeat(T, [len(p) for p in peaks]),
+        y=np.concatenate(peaks),
+        mode="markers",
+        marker=dict(color="white", size=5, line=dict(color="black", width=1)),
+        name="Peaks",
+        showlegend=False,
+        hovertemplate="%{x:.0f} K: %{y:.3g} s⁻¹<extra>peak</extra>",
+    ))
+    fig.update_layout(
+        xaxis_title="Temperature (K)",
+        yaxis_title="Emission rate (s⁻¹)",
+        yaxis_type="log"
+    )
+    return fig
@@ -0,0 +1,229 @@
+import numpy as np
+
+
+# -----------------------------
+# Lattice generation
+# -----------------------------
+# Diamond cubic basis (fractional coordinates of the conventional cell)
+DIAMOND_BASIS = np.array([
+    [0,   0,   0],
+    [0,   0.5, 0.5],
+    [0.5, 0,   0.5],
+    [0.5, 0.5, 0],
+    [0.25, 0.25, 0.25],
+    [0.25, 0.75, 0.75],
+    [0.75, 0.25, 0.75],
+    [0.75, 0.75, 0.25],
+])
+
+
+def build_supercell(a, n, m=None, l=None, basis=DIAMOND_BASIS, dtype=np.float64):
+    """Return the Cartesian positions of an n x m x l supercell.
+
+    Every cell offset is added to every basis vector in one broadcast, so
+    the result is built without Python loops. Atoms are ordered cell by
+    cell (i, then j, then k) with the basis atoms of each cell together.
+    The periodic box of the result is `a * (n, m, l)`. Pass
+    `dtype=np.float32` to halve the memory of very large supercells.
+    """
+    m = n if m is None else m
+    l = n if l is None else l
+    basis = np.asarray(basis, dtype=dtype)
+
+    cells = np.indices((n, m, l), dtype=dtype).reshape(3, -1).T
+    atoms = cells[:, None, :] + basis[None, :, :]
+    atoms *= np.asarray(a, dtype=dtype)
+    return atoms.reshape(-1, 3)
+
+
+# -----------------------------
+# Defect sites
+# -----------------------------
+DEFECTS = ("Boron-vacancy", "Boron", "Vacancy", "None")
+
+
+def place_defect(atoms, defect="Boron-vacancy"):
+    """Split `atoms` into (silicon, boron, vacancy) positions for `defect`.
+
+    Boron substitutes the atom closest to the centre of the lattice and
+    the vacancy is its nearest neighbour (or the central atom itself when
+    there is no boron). Species that are absent come back as empty
+    (0, 3) arrays.
+    """
+    if defect not in DEFECTS:
+        raise ValueError(f"Unknown defect {defect!r}, expected one of {DEFECTS}")
+
+    atoms = np.asarray(atoms)
+    center = atoms.mean(axis=0)
+    dist = np.linalg.norm(atoms - center, axis=1)
+    c_index = int(np.argmin(dist))
+
+    b_index = vac_index = None
+    if defect in ("Boron-vacancy", "Boron"):
+        b_index = c_index
+    if defect == "Vacancy":
+        vac_index = c_index
+    if defect == "Boron-vacancy":
+        # Vacancy = nearest neighbour to boron
+        dist_to_b = np.linalg.norm(atoms - atoms[b_index], axis=1)
+        dist_to_b[b_index] = np.inf
+        vac_index = int(np.argmin(dist_to_b))
+
+    removed = [idx for idx in (b_index, vac_index) if idx is not None]
+    mask = np.ones(len(atoms), dtype=bool)
+    mask[removed] = False
+
+    silicon = atoms[mask]
+    boron = atoms[[b_index] if b_index is not None else []]
+    vacancy = atoms[[vac_index] if vac_index is not None else []]
+    return silicon, boron, vacancy
+
+
+# -----------------------------
+# Neighbour search (cell list)
+# -----------------------------
+# All 27 neighbouring cell offsets, including the cell itself
+_CELL_OFFSETS = np.array(
+    [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+)
+
+
+def find_pairs(positions, cutoff, box=None):
+    """Return index pairs (i, j), i < j, closer than `cutoff`.
+
+    Atoms are binned into cells at least `cutoff` wide, so only the 27
+    surrounding cells are searched for each atom and the cost grows linearly
+    with the number of atoms. If `box` (the three supercell lengths) is
+    given, the search wraps around the periodic boundaries using the
+    minimum-image convention.
+    """
+    positions = np.asarray(positions, dtype=float)
+    n_atoms = len(positions)
+    if n_atoms < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    if box is None:
+        origin = positions.min(axis=0)
+        extent = positions.max(axis=0) - origin
+    else:
+        box = np.broadcast_to(np.asarray(box, dtype=float), (3,))
+        origin = np.zeros(3)
+        extent = box
+
+    n_cells = np.maximum((extent // cutoff).astype(int), 1)
+    cell_size = np.where(extent > 0, extent / n_cells, 1.0)
+
+    coords = np.floor((positions - origin) / cell_size).astype(int)
+    if box is None:
+        coords = np.clip(coords, 0, n_cells - 1)
+    else:
+        coords %= n_cells
+
+    # Sort atoms by flat cell id so every cell is a contiguous slice
+    cell_id = np.ravel_multi_index(coords.T, n_cells)
+    order = np.argsort(cell_id, kind="stable")
+    total_cells = int(np.prod(n_cells))
+    counts = np.bincount(cell_id, minlength=total_cells)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    pairs_i, pairs_j = [], []
+    for offset in _CELL_OFFSETS:
+        neigh = coords + offset
+        if box is None:
+            valid = np.all((neigh >= 0) & (neigh < n_cells), axis=1)
+            atoms_i = np.nonzero(valid)[0]
+            neigh = neigh[valid]
+        else:
+            atoms_i = np.arange(n_atoms)
+            neigh = neigh % n_cells
+        neigh_id = np.ravel_multi_index(neigh.T, n_cells)
+
+        # Expand every atom against every member of its neighbour cell
+        per_atom = counts[neigh_id]
+        i = np.repeat(atoms_i, per_atom)
+        first = np.repeat(starts[neigh_id], per_atom)
+        local = np.arange(len(i)) - np.repeat(np.cumsum(per_atom) - per_atom, per_atom)
+        j = order[first + local]
+
+        keep = i < j
+        pairs_i.append(i[keep])
+        pairs_j.append(j[keep])
+
+    i = np.concatenate(pairs_i)
+    j = np.concatenate(pairs_j)
+
+    delta = positions[j] - positions[i]
+    if box is not None:
+        delta -= box * np.round(delta / box)
+    close = np.einsum("ij,ij->i", delta, delta) < cutoff ** 2
+    i, j = i[close], j[close]
+
+    # Small periodic boxes (< 3 cells per side) visit the same cell twice
+    if box is not None and np.any(n_cells < 3):
+        key = np.unique(i * n_atoms + j)
+        i, j = key // n_atoms, key % n_atoms
+
+    return i, j
+
+
+def bond_segments(positions, cutoff, box=None):
+    """Return NaN-separated x, y, z arrays for drawing every bond as lines.
+
+    Each bond occupies three slots (start, end, NaN) so all bonds can go in
+    a single Plotly line trace. Bonds that cross a periodic boundary are
+    drawn from the atom towards its nearest periodic image.
+    """
+    positions = np.asarray(positions, dtype=float)
+    i, j = find_pairs(positions, cutoff, box)
+
+    start = positions[i]
+    end = positions[j]
+    if box is not None:
+        box = np.broadcast_to(np.asarray(box, dtype=float), (3,))
+        delta = end - start
+        end = start + delta - box * np.round(delta / box)
+
+    segments = np.full((len(i), 3, 3), np.nan)
+    segments[:, 0] = start
+    segments[:, 1] = end
+    segments = segments.reshape(-1, 3)
+    return segments[:, 0], segments[:, 1], segments[:, 2]
+
+
+# -----------------------------
+# Cell boundaries
+# -----------------------------
+def cell_edges(a, n, m=None, l=None, every_cell=False):
+    """Return NaN-separated x, y, z arrays for the supercell boundary lines.
+
+    By default only the 12 edges of the outer box are returned. With
+    `every_cell=True` the boundaries of every unit cell are drawn, merged
+    into one full-length line per grid row so the point count grows with
+    the number of grid lines rather than the number of cells.
+    """
+    m = n if m is None else m
+    l = n if l is None else l
+    counts = np.array([n, m, l])
+    size = a * counts
+
+    segments = []
+    for axis in range(3):
+        other = [ax for ax in range(3) if ax != axis]
+        if every_cell:
+            u = a * np.arange(counts[other[0]] + 1)
+            v = a * np.arange(counts[other[1]] + 1)
+        else:
+            u = np.array([0.0, size[other[0]]])
+            v = np.array([0.0, size[other[1]]])
+        uu, vv = np.meshgrid(u, v, indexing="ij")
+
+        lines = np.full((uu.size, 3, 3), np.nan)
+        lines[:, :2, other[0]] = uu.reshape(-1, 1)
+        lines[:, :2, other[1]] = vv.reshape(-1, 1)
+        lines[:, 0, axis] = 0.0
+        lines[:, 1, axis] = size[axis]
+        segments.append(lines.reshape(-1, 3))
+
+    segments = np.concatenate(segments)
+    return segments[:, 0], segments[:, 1], segments[:, 2]
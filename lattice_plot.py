@@ -0,0 +1,191 @@
+import threading
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from lattice import DIAMOND_BASIS, bond_segments, build_supercell, cell_edges, place_defect
+
+
+# -----------------------------
+# Level-of-detail limits
+# -----------------------------
+# Beyond these sizes the figure payload sent by st.plotly_chart gets too
+# large for the browser to render smoothly.
+MAX_ATOMS = 5000
+MAX_BOND_SEGMENTS = 20000
+
+# CPK colours and marker sizes
+SI_COLOR = "black"
+B_COLOR = "blue"
+VAC_COLOR = "red"
+BOND_COLOR = "gray"
+SI_SIZE = 9
+B_SIZE = 10
+VAC_SIZE = 10
+
+
+def _subsample(count, keep):
+    """Evenly spaced indices keeping `keep` out of `count` points."""
+    if keep >= count:
+        return np.arange(count)
+    return np.linspace(0, count - 1, max(keep, 0)).astype(int)
+
+
+def lattice_figure(
+    species,
+    bonds=None,
+    edges=None,
+    title=None,
+    bond_color="gray",
+    bond_width=4,
+    edge_color="black",
+    edge_width=2,
+    max_atoms=MAX_ATOMS,
+    max_bond_segments=MAX_BOND_SEGMENTS,
+):
+    """Build the 3D lattice figure from a handful of merged traces.
+
+    `species` is a list of (name, positions, color, size, symbol) tuples.
+    All atoms go into a single marker trace with per-point colour, size and
+    symbol arrays, and `bonds` / `edges` are NaN-separated (x, y, z) arrays
+    drawn as one line trace each, so the number of traces no longer grows
+    with the supercell.
+
+    Level of detail: if there are more than `max_atoms` atoms, the most
+    numerous species is evenly subsampled (the rarer defect species are
+    always kept) and bonds are hidden, since they would no longer match
+    the atoms shown. Bonds are also hidden when they exceed
+    `max_bond_segments`.
+    """
+    names = [s[0] for s in species]
+    positions = [np.asarray(s[1], dtype=float).reshape(-1, 3) for s in species]
+    counts = np.array([len(p) for p in positions])
+
+    subsampled = counts.sum() > max_atoms
+    if subsampled:
+        largest = int(np.argmax(counts))
+        keep = max_atoms - (counts.sum() - counts[largest])
+        positions[largest] = positions[largest][_subsample(counts[largest], keep)]
+        counts[largest] = len(positions[largest])
+
+    xyz = np.concatenate(positions)
+    code = np.repeat(np.arange(len(species)), counts)
+    sizes = np.array([s[3] for s in species], dtype=float)[code]
+    symbols = np.array([s[4] for s in species])[code]
+    labels = np.array(names)[code]
+
+    # Stepped colourscale so each species code maps to exactly one colour
+    k = len(species)
+    colorscale = []
+    for i, s in enumerate(species):
+        colorscale += [[i / k, s[2]], [(i + 1) / k, s[2]]]
+
+    fig = go.Figure()
+
+    if bonds is not None and not subsampled and len(bonds[0]) // 3 <= max_bond_segments:
+        fig.add_trace(go.Scatter3d(
+            x=bonds[0], y=bonds[1], z=bonds[2],
+            mode="lines",
+            line=dict(color=bond_color, width=bond_width),
+            hoverinfo="skip",
+            name="Bonds"
+        ))
+
+    fig.add_trace(go.Scatter3d(
+        x=xyz[:, 0], y=xyz[:, 1], z=xyz[:, 2],
+        mode="markers",
+        marker=dict(
+            size=sizes,
+            color=code,
+            colorscale=colorscale,
+            cmin=-0.5,
+            cmax=k - 0.5,
+            symbol=symbols,
+        ),
+        text=labels,
+        hoverinfo="text",
+        showlegend=False,
+        name="Atoms"
+    ))
+
+    # Legend-only entries, one per species
+    for name, color, size, symbol in ((s[0], s[2], s[3], s[4]) for s in species):
+        fig.add_trace(go.Scatter3d(
+            x=[None], y=[None], z=[None],
+            mode="markers",
+            marker=dict(size=size, color=color, symbol=symbol),
+            name=name
+        ))
+
+    if edges is not None:
+        fig.add_trace(go.Scatter3d(
+            x=edges[0], y=edges[1], z=edges[2],
+            mode="lines",
+            line=dict(color=edge_color, width=edge_width),
+            hoverinfo="skip",
+            showlegend=False
+        ))
+
+    fig.update_layout(
+        title=title,
+        scene=dict(
+            aspectmode="cube",
+            xaxis_visible=False,
+            yaxis_visible=False,
+            zaxis_visible=False
+        )
+    )
+    return fig
+
+
+# -----------------------------
+# Cached silicon defect figure
+# -----------------------------
+_cache_lock = threading.Lock()
+_cache_stats = {"calls": 0, "misses": 0}
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _silicon_figure(a, n, bond_cutoff, defect):
+    with _cache_lock:
+        _cache_stats["misses"] += 1
+
+    atoms = build_supercell(a, n, basis=DIAMOND_BASIS)
+    silicon, boron, vacancy = place_defect(atoms, defect)
+
+    # Bonds (excluding vacancy)
+    bonds = bond_segments(np.vstack([silicon, boron]), bond_cutoff)
+
+    species = [
+        ("Si", silicon, SI_COLOR, SI_SIZE, "circle"),
+        ("B", boron, B_COLOR, B_SIZE, "circle"),
+        ("Vacancy", vacancy, VAC_COLOR, VAC_SIZE, "x"),
+    ]
+    title = "Silicon Lattice" if defect == "None" else f"Silicon Lattice with {defect} Defect"
+    fig = lattice_figure(
+        species=[s for s in species if len(s[1])],
+        bonds=bonds,
+        edges=cell_edges(a, n),
+        bond_color=BOND_COLOR,
+        title=title
+    )
+    return fig.to_dict()
+
+
+def silicon_figure(a, n, bond_cutoff, defect="Boron-vacancy"):
+    """Return the silicon supercell figure (as a Plotly dict) for `defect`.
+
+    The lattice, defect sites, bonds and figure are only rebuilt when one of
+    the arguments changes; every other rerun is served from the cache.
+    """
+    with _cache_lock:
+        _cache_stats["calls"] += 1
+    return _silicon_figure(float(a), int(n), float(bond_cutoff), defect)
+
+
+def figure_cache_stats():
+    """Hit/miss counters of the silicon figure cache for this process."""
+    with _cache_lock:
+        calls, misses = _cache_stats["calls"], _cache_stats["misses"]
+    return {"hits": calls - misses, "misses": misses}
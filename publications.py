@@ -0,0 +1,158 @@
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+
+# Searchable text fields of a Publication
+SEARCH_FIELDS = ("title", "authors", "source")
+
+_TOKEN = re.compile(r"\w+")
+_YEAR = re.compile(r"(?<!\d)\d{4}(?!\d)")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def parse_year(value):
+    """The four-digit year in `value` (e.g. 2021, "2021", "2021a"), or None."""
+    match = _YEAR.search(str(value)) if isinstance(value, (int, str)) else None
+    return int(match[0]) if match else None
+
+
+# -----------------------------
+# Publication record
+# -----------------------------
+@dataclass(frozen=True, slots=True)
+class Publication:
+    """One publication, from Google Scholar or the archived list."""
+
+    title: str
+    year: int | None = None
+    authors: str = ""
+    source: str = ""
+    author_pub_id: str | None = None    # only set for Scholar entries
+    num_citations: int = 0
+
+    @classmethod
+    def from_scholarly(cls, pub):
+        bib = pub.get('bib', {})
+        return cls(
+            title=bib.get('title', ""),
+            year=parse_year(bib.get('pub_year')),
+            authors=bib.get('author', ""),
+            source=bib.get('journal') or bib.get('citation', ""),
+            author_pub_id=pub.get('author_pub_id'),
+            num_citations=pub.get('num_citations', 0),
+        )
+
+
+class PublicationList:
+    """Publications sorted newest first, with a year index.
+
+    Sorting happens once on construction (stable, so entries of the same
+    year keep their order); `in_years()` then finds a year range by
+    bisection instead of scanning the list.
+    """
+
+    __slots__ = ("items", "_keys", "_index")
+
+    def __init__(self, pubs=()):
+        self.items = tuple(sorted(pubs, key=lambda p: -(p.year or 0)))
+        # Ascending keys for bisect (newest year has the smallest key)
+        self._keys = [-(p.year or 0) for p in self.items]
+        self._index = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __eq__(self, other):
+        return isinstance(other, PublicationList) and self.items == other.items
+
+    def __hash__(self):
+        return hash(self.items)
+
+    def __repr__(self):
+        return f"PublicationList({len(self.items)} publications)"
+
+    @property
+    def years(self):
+        """Distinct publication years, newest first (0 for undated)."""
+        return list(dict.fromkeys(-k for k in self._keys))
+
+    def _year_range(self, start, end):
+        return bisect_left(self._keys, -end), bisect_right(self._keys, -start)
+
+    def in_years(self, start, end):
+        """Publications with start <= year <= end, newest first."""
+        lo, hi = self._year_range(start, end)
+        return self.items[lo:hi]
+
+    def search(self, query="", field=None, years=None):
+        """Publications matching every word of `query`, newest first.
+
+        Words match by prefix, so partial input already narrows the list.
+        `field` restricts the match to one of SEARCH_FIELDS and `years` is
+        an inclusive (start, end) range. The inverted index is built on the
+        first search and reused afterwards.
+        """
+        if self._index is None:
+            self._index = PublicationIndex(self.items)
+        positions = self._index.lookup(query, field)
+        if years is not None:
+            lo, hi = self._year_range(*years)
+            if positions is None:
+                return self.items[lo:hi]
+            positions = [i for i in positions if lo <= i < hi]
+        if positions is None:
+            return self.items
+        return tuple(self.items[i] for i in positions)
+
+
+# -----------------------------
+# Full-text search
+# -----------------------------
+class PublicationIndex:
+    """Inverted index from (field, word) to publication positions."""
+
+    def __init__(self, pubs):
+        postings = {}
+        for i, pub in enumerate(pubs):
+            for field in SEARCH_FIELDS:
+                for token in set(tokenize(getattr(pub, field) or "")):
+                    postings.setdefault((field, token), []).append(i)
+        self._postings = postings
+        # Sorted words per field for prefix lookups by bisection
+        self._words = {
+            field: sorted(t for f, t in postings if f == field) for field in SEARCH_FIELDS
+        }
+
+    def _prefix(self, field, prefix):
+        words = self._words[field]
+        start = bisect_left(words, prefix)
+        hits = set()
+        for word in words[start:]:
+            if not word.startswith(prefix):
+                break
+            hits.update(self._postings[(field, word)])
+        return hits
+
+    def lookup(self, query, field=None):
+        """Sorted positions matching all words, or None for an empty query."""
+        tokens = tokenize(query or "")
+        if not tokens:
+            return None
+        fields = SEARCH_FIELDS if field is None else (field,)
+        result = None
+        for token in tokens:
+            hits = set().union(*(self._prefix(f, token) for f in fields))
+            result = hits if result is None else result & hits
+            if not result:
+                break
+        return sorted(result)
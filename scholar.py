@@ -0,0 +1,577 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import streamlit as st
+
+from publications import Publication, PublicationList
+
+
+# -----------------------------
+# Settings
+# -----------------------------
+# Both can be overridden through environment variables on the server
+REFRESH_TTL = int(os.environ.get("SCHOLAR_CACHE_TTL", 86400))   # refresh once a day (s)
+RETRY_AFTER = 600       # wait this long after a failed refresh or abstract fetch (s)
+PREFETCH_WORKERS = 4    # concurrent abstract requests
+PREFETCH_INTERVAL = 2.0 # minimum time between abstract requests (s)
+
+# On-disk snapshots of the last good profile, so restarts start warm
+CACHE_DIR = Path(os.environ.get("SCHOLAR_CACHE_DIR", Path(__file__).parent / ".cache" / "scholar"))
+SNAPSHOT_SCHEMA = 3
+
+# Sections requested from the author page, all in one fill() call
+PROFILE_SECTIONS = ['basics', 'indices', 'counts', 'publications']
+
+# Data source: "live" scrapes Google Scholar, "fixture" serves a recorded
+# profile offline (with optional simulated latency and failures)
+SOURCE = os.environ.get("SCHOLAR_SOURCE", "live")
+FIXTURE_PATH = Path(os.environ.get(
+    "SCHOLAR_FIXTURE", Path(__file__).parent / "fixtures" / "scholar_author.json"
+))
+
+
+# -----------------------------
+# Profile record
+# -----------------------------
+@dataclass(frozen=True, slots=True)
+class ScholarProfile:
+    """The parts of a Scholar author profile the site shows.
+
+    Much smaller than the raw scholarly dict, which makes it cheap to cache,
+    hash and write to disk.
+    """
+
+    name: str = ""
+    affiliation: str = ""
+    citedby: int = 0
+    hindex: int = 0
+    i10index: int = 0
+    cites_per_year: tuple = ()  # ((year, citations), ...) in year order
+    publications: PublicationList = PublicationList()
+
+    @classmethod
+    def from_scholarly(cls, author):
+        pubs = [Publication.from_scholarly(pub) for pub in author.get('publications', [])]
+        return cls(
+            name=author.get('name', ""),
+            affiliation=author.get('affiliation', ""),
+            citedby=author.get('citedby', 0),
+            hindex=author.get('hindex', 0),
+            i10index=author.get('i10index', 0),
+            cites_per_year=tuple(sorted(
+                (int(y), int(c)) for y, c in author.get('cites_per_year', {}).items()
+            )),
+            publications=PublicationList(pubs),
+        )
+
+    def to_dict(self):
+        data = {f: getattr(self, f) for f in self.__slots__}
+        data['publications'] = [asdict(p) for p in self.publications]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        # JSON turns the tuples into lists
+        data['cites_per_year'] = tuple(tuple(p) for p in data.get('cites_per_year', ()))
+        data['publications'] = PublicationList(Publication(**p) for p in data.get('publications', ()))
+        return cls(**data)
+
+
+# Fallback data so the site doesn't look broken
+FALLBACK_PROFILE = ScholarProfile(
+    citedby=5,  # Manual update required occasionally
+    hindex=1,
+    i10index=0,
+)
+
+
+def fetch_profile(scholar_id):
+    """Scrape the author profile from Google Scholar (slow, may raise)."""
+    # scholarly takes most of a second to import, so it is only loaded by
+    # the background refresh that actually needs it
+    from scholarly import scholarly
+
+    author = scholarly.search_author_id(scholar_id)
+    author = scholarly.fill(author, sections=PROFILE_SECTIONS)
+    return ScholarProfile.from_scholarly(author)
+
+
+# -----------------------------
+# Persistent snapshot
+# -----------------------------
+class ProfileSnapshot:
+    """JSON snapshot of a profile that survives process restarts.
+
+    The file records its schema version and save time; snapshots written
+    with another schema version are ignored. Writes go through a temporary
+    file so a crash never leaves a half-written snapshot behind.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self):
+        """Return (profile, saved_at), or (None, None) if there is none."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        if snapshot.get("schema") != SNAPSHOT_SCHEMA:
+            return None, None
+        return ScholarProfile.from_dict(snapshot["profile"]), snapshot["saved_at"]
+
+    def save(self, profile, saved_at=None):
+        snapshot = {
+            "schema": SNAPSHOT_SCHEMA,
+            "saved_at": time.time() if saved_at is None else saved_at,
+            "profile": profile.to_dict(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp, self.path)
+
+    def delete(self):
+        self.path.unlink(missing_ok=True)
+
+
+# -----------------------------
+# Citation history
+# -----------------------------
+class CitationHistory:
+    """Citations per year, kept in an append-only JSON-lines file.
+
+    `update()` only appends the years whose count is new or changed since
+    the last refresh, so a refresh writes a line or two instead of the
+    whole history. Loading replays the file; the latest line per year wins.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._counts = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue    # skip a line cut short by a crash
+                    self._counts[int(entry["year"])] = int(entry["citations"])
+        except OSError:
+            pass
+
+    def update(self, cites_per_year):
+        """Record (year, citations) pairs; returns the number appended."""
+        with self._lock:
+            changed = [
+                (int(y), int(c)) for y, c in cites_per_year if self._counts.get(int(y)) != int(c)
+            ]
+            if not changed:
+                return 0
+            now = time.time()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for year, citations in changed:
+                    f.write(json.dumps({"year": year, "citations": citations, "recorded_at": now}) + "\n")
+            self._counts.update(changed)
+            return len(changed)
+
+    def series(self):
+        """((year, citations), ...) in year order."""
+        with self._lock:
+            return tuple(sorted(self._counts.items()))
+
+
+# -----------------------------
+# Stale-while-revalidate cache
+# -----------------------------
+class ScholarProfileCache:
+    """Serves the last good profile at once and refreshes it in the background.
+
+    `get()` never waits for Google Scholar: when the profile is older than
+    `ttl` a daemon thread re-scrapes it while the previous result (or the
+    fallback, before the first success) keeps being served. Failed
+    refreshes keep the old data and are retried after `retry_after`.
+
+    With a `snapshot`, the last good profile is loaded from disk on start-up
+    (keeping its original age) and saved after every successful refresh.
+    With a `history`, each refresh also appends the changed citation counts.
+    """
+
+    def __init__(self, scholar_id, fetch=fetch_profile, ttl=REFRESH_TTL, retry_after=RETRY_AFTER,
+                 snapshot=None, history=None):
+        self.scholar_id = scholar_id
+        self.fetch = fetch
+        self.ttl = ttl
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._data = None
+        self._refreshing = False
+        self.last_success = None    # time.time() of the last good fetch
+        self.last_attempt = None
+        self.last_latency = None    # duration of the last fetch (s)
+        self.last_error = None
+
+        self.snapshot = snapshot
+        if snapshot is not None:
+            self._data, self.last_success = snapshot.load()
+
+        self.history = history
+        if history is not None and self._data is not None:
+            try:
+                history.update(self._data.cites_per_year)
+            except OSError:
+                pass    # retried after the next successful refresh
+
+    def get(self):
+        """Return the current profile without blocking on the network."""
+        with self._lock:
+            data = self._data
+        if self._needs_refresh():
+            self.refresh_async()
+        return data if data is not None else FALLBACK_PROFILE
+
+    @property
+    def is_live(self):
+        with self._lock:
+            return self._data is not None
+
+    def _needs_refresh(self):
+        now = time.time()
+        with self._lock:
+            if self._refreshing:
+                return False
+            if self.last_error is not None and now - self.last_attempt < self.retry_after:
+                return False
+            return self.last_success is None or now - self.last_success > self.ttl
+
+    def refresh_async(self):
+        """Start a background refresh unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        start = time.time()
+        try:
+            data = self.fetch(self.scholar_id)
+        except Exception as e:
+            with self._lock:
+                self.last_error = repr(e)
+        else:
+            with self._lock:
+                self._data = data
+                self.last_success = time.time()
+                self.last_error = None
+            try:
+                if self.snapshot is not None:
+                    self.snapshot.save(data, self.last_success)
+                if self.history is not None:
+                    self.history.update(data.cites_per_year)
+            except OSError as e:
+                with self._lock:
+                    self.last_error = repr(e)
+        finally:
+            with self._lock:
+                self.last_attempt = start
+                self.last_latency = time.time() - start
+                self._refreshing = False
+
+    def invalidate(self, drop_data=False):
+        """Mark the profile stale and delete its snapshot.
+
+        The next get() starts a refresh. With `drop_data` the in-memory
+        profile is discarded too, so the fallback is served until then.
+        """
+        with self._lock:
+            self.last_success = None
+            self.last_error = None
+            if drop_data:
+                self._data = None
+        if self.snapshot is not None:
+            self.snapshot.delete()
+
+    def status(self):
+        """Refresh bookkeeping, e.g. for logging or a debug panel."""
+        with self._lock:
+            return {
+                "live": self._data is not None,
+                "refreshing": self._refreshing,
+                "last_success": self.last_success,
+                "last_attempt": self.last_attempt,
+                "last_latency": self.last_latency,
+                "last_error": self.last_error,
+            }
+
+
+# -----------------------------
+# Publication details
+# -----------------------------
+class RateLimiter:
+    """Spaces out calls from any number of threads by `interval` seconds."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(start - now)
+
+
+def fetch_abstract(pub):
+    """Fill one Scholar publication and return its abstract."""
+    from scholarly import scholarly
+    from scholarly.data_types import PublicationSource
+
+    # Rebuild the scholarly container for this Publication record
+    full_pub = scholarly.fill({
+        'container_type': 'Publication',
+        'source': PublicationSource.AUTHOR_PUBLICATION_ENTRY,
+        'author_pub_id': pub.author_pub_id,
+        'bib': {'title': pub.title},
+        'filled': False,
+    })
+    return full_pub.get('bib', {}).get('abstract', 'No abstract available.')
+
+
+class PublicationDetailCache:
+    """Abstracts keyed by `author_pub_id`, prefetched in the background.
+
+    `prefetch()` queues every publication that is not cached yet for a few
+    daemon worker threads, so a server restart never waits for the queue
+    to drain; requests go through a shared rate limiter so Scholar is not
+    hammered, and a publication whose fetch failed is not queued again for
+    `retry_after` seconds. Finished abstracts are shared by all sessions.
+    """
+
+    def __init__(self, fetch=fetch_abstract, workers=PREFETCH_WORKERS, interval=PREFETCH_INTERVAL,
+                 retry_after=RETRY_AFTER):
+        self.fetch = fetch
+        self.retry_after = retry_after
+        self._limiter = RateLimiter(interval)
+        self._lock = threading.Lock()
+        self._abstracts = {}
+        self._queued = set()    # waiting for a worker
+        self._running = {}      # fetches in progress, with an Event set when done
+        self._failed = {}       # time.time() of each publication's last failure
+        self.errors = {}
+
+        self._queue = queue.SimpleQueue()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"abstracts-{i}", daemon=True).start()
+
+    def get(self, pub_id):
+        """The cached abstract, or None if it has not been fetched yet."""
+        with self._lock:
+            return self._abstracts.get(pub_id)
+
+    def prefetch(self, pubs):
+        """Queue background fetches for publications not cached, queued or running."""
+        now = time.time()
+        for pub in pubs:
+            pub_id = pub.author_pub_id
+            with self._lock:
+                if pub_id is None or pub_id in self._abstracts:
+                    continue
+                if pub_id in self._queued or pub_id in self._running:
+                    continue
+                if now - self._failed.get(pub_id, -self.retry_after) < self.retry_after:
+                    continue
+                self._queued.add(pub_id)
+            self._queue.put((pub_id, pub))
+
+    def fetch_now(self, pub):
+        """Fetch one abstract in the calling thread (e.g. on a button click).
+
+        A publication still waiting in the prefetch queue is taken off it
+        and fetched here; one already being fetched is waited for, so it is
+        never requested twice. The request waits for the shared rate
+        limiter like a prefetch. Returns None if it fails; the error is
+        kept in `errors`.
+        """
+        pub_id = pub.author_pub_id
+        abstract = self.get(pub_id)
+        if abstract is not None:
+            return abstract
+        with self._lock:
+            done = self._running.get(pub_id)
+            if done is None:
+                self._queued.discard(pub_id)
+                done = self._running[pub_id] = threading.Event()
+                waiting = False
+            else:
+                waiting = True
+        if waiting:
+            done.wait()
+            return self.get(pub_id)
+        return self._run(pub_id, pub, done)
+
+    def _run(self, pub_id, pub, done):
+        """One rate-limited fetch; the abstract, or None if it failed."""
+        try:
+            self._limiter.wait()
+            abstract = self.fetch(pub)
+        except Exception as e:
+            with self._lock:
+                self.errors[pub_id] = repr(e)
+                self._failed[pub_id] = time.time()
+            abstract = None
+        else:
+            with self._lock:
+                self._abstracts[pub_id] = abstract
+                self.errors.pop(pub_id, None)
+                self._failed.pop(pub_id, None)
+        finally:
+            with self._lock:
+                del self._running[pub_id]
+            done.set()
+        return abstract
+
+    def _work(self):
+        while True:
+            pub_id, pub = self._queue.get()
+            with self._lock:
+                # Skip entries fetch_now() has taken off the queue
+                if pub_id not in self._queued:
+                    continue
+                self._queued.discard(pub_id)
+                done = self._running[pub_id] = threading.Event()
+            self._run(pub_id, pub, done)
+
+
+# -----------------------------
+# Data sources
+# -----------------------------
+class ScholarSource(ABC):
+    """Where profiles and abstracts come from."""
+
+    name = "base"
+
+    @abstractmethod
+    def fetch_profile(self, scholar_id):
+        """The Scholar profile of `scholar_id`, as fetch_profile() returns it."""
+
+    @abstractmethod
+    def fetch_abstract(self, pub):
+        """The abstract of one Publication."""
+
+
+class LiveScholarSource(ScholarSource):
+    """Google Scholar through scholarly."""
+
+    name = "live"
+
+    def fetch_profile(self, scholar_id):
+        return fetch_profile(scholar_id)
+
+    def fetch_abstract(self, pub):
+        return fetch_abstract(pub)
+
+
+class FixtureScholarSource(ScholarSource):
+    """A recorded profile served from a local JSON file, no network needed.
+
+    The fixture holds a scholarly-style "author" dict and an "abstracts"
+    map keyed by author_pub_id. Every call sleeps for `latency` seconds
+    (+/- `jitter`) and raises ConnectionError with probability
+    `failure_rate`, so the fallback and retry paths can be exercised and
+    benchmarked offline.
+    """
+
+    name = "fixture"
+
+    def __init__(self, path=FIXTURE_PATH, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        self._author = fixture["author"]
+        self._abstracts = fixture.get("abstracts", {})
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _simulate(self):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        time.sleep(delay)
+        if fail:
+            raise ConnectionError("Injected Scholar failure")
+
+    def fetch_profile(self, scholar_id):
+        self._simulate()
+        return ScholarProfile.from_scholarly(self._author)
+
+    def fetch_abstract(self, pub):
+        self._simulate()
+        return self._abstracts.get(pub.author_pub_id, 'No abstract available.')
+
+
+def get_source():
+    """The data source selected by the SCHOLAR_* environment variables."""
+    if SOURCE == "fixture":
+        return FixtureScholarSource(
+            FIXTURE_PATH,
+            latency=float(os.environ.get("SCHOLAR_LATENCY", 0)),
+            failure_rate=float(os.environ.get("SCHOLAR_FAILURE_RATE", 0)),
+        )
+    return LiveScholarSource()
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_source():
+    return get_source()
+
+
+@st.cache_resource(show_spinner=False)
+def get_profile_cache(scholar_id):
+    """One shared profile cache per Scholar ID for the whole server."""
+    source = _shared_source()
+    # Offline runs keep their own snapshot so they never replace live data
+    cache_dir = CACHE_DIR if source.name == "live" else CACHE_DIR / source.name
+    snapshot = ProfileSnapshot(cache_dir / f"{scholar_id}.json")
+    history = CitationHistory(cache_dir / f"{scholar_id}_citations.jsonl")
+    return ScholarProfileCache(
+        scholar_id, fetch=source.fetch_profile, snapshot=snapshot, history=history
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_detail_cache(scholar_id):
+    """One shared abstract cache per Scholar ID for the whole server."""
+    return PublicationDetailCache(fetch=_shared_source().fetch_abstract)
+
+
+@st.cache_data(show_spinner=False)
+def citation_chart_data(series):
+    """Chart-ready citations per year, rebuilt only when the series changes."""
+    import pandas as pd
+
+    df = pd.DataFrame(list(series), columns=["Year", "Citations"])
+    df["Year"] = df["Year"].astype(str)
+    return df.set_index("Year")